@@ -0,0 +1,456 @@
+"""
+Measure the latency, the number of queries and the throughput of every route
+of `post/routers.py`, `user/routers.py` and `photo/routers.py`, and of the media files.
+
+A throwaway test database is created from the models and filled by
+`manage.py seed`, then every route is requested in-process with the test client
+and the results are printed as JSON so that runs can be compared across commits.
+
+    $ python -m benchmarks.api --posts 10000 --requests 200 --output before.json
+"""
+import argparse
+from contextlib import contextmanager
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+# The routes (by their beginning) which are not requested and why.
+SKIPPED = {
+    'user/auth/github/': 'needs an access token issued by GitHub',
+    'user/auth/google/': 'needs an access token issued by Google',
+    'user/auth/password/reset/confirm/(?P<uidb64>':
+        'the pattern spans a line continuation and matches no path',
+}
+
+# Only the routes of these URLconfs are benchmarked.
+PREFIXES = ('user/', 'posts', 'photos', 'media')
+
+
+class Scenario(NamedTuple):
+    name: str
+    method: str
+    path: Callable[[int], str]
+    data: Optional[Callable[[int], Any]] = None
+    auth: bool = False
+    # Clear the cache before every request to measure a cold cache.
+    cold: bool = False
+    headers: Optional[Callable[[int], Dict[str, str]]] = None
+    format: str = 'json'
+    # Routes that hash passwords or send emails are requested less often.
+    limit: Optional[int] = None
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """
+    The nearest-rank percentile of sorted values.
+
+        Example:
+        >>> percentile([1.0, 2.0, 3.0, 4.0], 50)
+        2.0
+    """
+    if not values:
+        return 0.0
+    rank = max(int(-(-percent * len(values) // 100)), 1)
+    return values[rank - 1]
+
+
+def all_routes() -> List[str]:
+    """
+    The routes of the benchmarked URLconfs in the format of `ResolverMatch.route`
+    without the `.json` style format suffixes.
+    """
+    from django.urls import URLResolver, get_resolver
+
+    def walk(patterns: List[Any], prefix: str) -> Iterator[str]:
+        for pattern in patterns:
+            route = str(pattern.pattern)
+            if prefix and route.startswith('^'):
+                route = route[1:]
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns, prefix + route)
+            else:
+                yield prefix + route
+
+    return sorted({route for route in walk(get_resolver().url_patterns, '')
+                   if route.startswith(PREFIXES) and '(?P<format>' not in route})
+
+
+def make_image() -> Any:
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 64), color=(72, 120, 200)).save(buffer, format='PNG')
+    return SimpleUploadedFile('benchmark.png', buffer.getvalue(), content_type='image/png')
+
+
+def prepare(pool_size: int) -> Dict[str, Any]:
+    """
+    Pick the objects that the scenarios work on, giving the benchmark user
+    enough posts and comments to update and delete.
+    """
+    from allauth.account.models import EmailAddress, EmailConfirmationHMAC
+    from django.core.files.base import ContentFile
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from common.media import file_etag
+    from photo.models import photo
+    from post.models import Comment, Post
+    from user.models import User
+
+    # The benchmark user is a moderator as well.
+    user = User.objects.earliest('id')
+    User.objects.filter(id=user.id).update(is_staff=True)
+    posts = list(Post.objects.filter(is_active=True).order_by('id')
+                 .values_list('id', flat=True)[:pool_size * 2])
+    own_posts, other_posts = posts[:pool_size], posts[pool_size:]
+    Post.objects.filter(id__in=own_posts).update(author=user)
+
+    comments = list(Comment.objects.filter(post_id__in=other_posts, is_active=True)
+                    .order_by('id')
+                    .values_list('id', flat=True)[:pool_size])
+    Comment.objects.filter(id__in=comments).update(author=user)
+
+    # Unverified addresses of other users to confirm.
+    addresses = list(EmailAddress.objects.exclude(user=user).order_by('id')[:pool_size * 2])
+    EmailAddress.objects.filter(id__in=[address.id for address in addresses]) \
+        .update(verified=False)
+    keys = [EmailConfirmationHMAC(address).key for address in addresses]
+
+    image = photo(photo_category='benchmark', photo_detail='benchmark')
+    image.image.save('benchmark.png', ContentFile(make_image().read()))
+    photo.objects.bulk_create([photo(photo_category='benchmark', photo_detail=str(i))
+                               for i in range(pool_size + 1)])
+    photos = list(photo.objects.order_by('id').values_list('id', flat=True))
+
+    refresh = RefreshToken.for_user(user)
+    most_commented = Post.objects.filter(is_active=True).order_by('-comment_count').first()
+    return {
+        'user': user,
+        'token': f'Bearer {refresh.access_token}',
+        'access': str(refresh.access_token),
+        'refresh': str(refresh),
+        'post': most_commented.id if most_commented else posts[0],
+        'own_posts': own_posts,
+        'other_posts': other_posts,
+        'comments': comments,
+        'keys': keys,
+        'image': image,
+        'image_etag': file_etag(os.stat(image.image.path)),
+        'photos': photos[1:],
+    }
+
+
+def make_scenarios(fixtures: Dict[str, Any]) -> List[Scenario]:
+    from django.contrib.auth.tokens import default_token_generator
+    from django.utils.encoding import force_bytes
+    from django.utils.http import urlsafe_base64_encode
+
+    from post.seeding import SEED_PASSWORD
+
+    user, post = fixtures['user'], fixtures['post']
+    own_posts, other_posts = fixtures['own_posts'], fixtures['other_posts']
+    comments, keys, photos = fixtures['comments'], fixtures['keys'], fixtures['photos']
+    half = len(keys) // 2
+
+    def post_data(i: int) -> Dict[str, Any]:
+        return {'title': f'Benchmark {i}', 'content': 'Benchmark', 'location': 'Seoul',
+                'capacity': 4, 'date': '2020-06-01', 'timeOfDay': 1, 'category': 1,
+                'tags': ['Tag1', f'benchmark{i % 10}']}
+
+    def reset_data(i: int) -> Dict[str, Any]:
+        user.refresh_from_db()
+        return {'uid': urlsafe_base64_encode(force_bytes(user.pk)),
+                'token': default_token_generator.make_token(user),
+                'new_password1': SEED_PASSWORD, 'new_password2': SEED_PASSWORD}
+
+    def etag(i: int) -> Dict[str, str]:
+        from django.test import Client
+
+        response = Client().get(f'/posts/{post}', secure=True)
+        return {'HTTP_IF_NONE_MATCH': response['ETag']}
+
+    credentials = {'email': user.email, 'password': SEED_PASSWORD}
+    return [
+        # post/routers.py
+        Scenario('categories.list', 'get', lambda i: '/posts/categories', cold=True),
+        Scenario('categories.list.cached', 'get', lambda i: '/posts/categories'),
+        Scenario('tags.list', 'get', lambda i: '/posts/tags', cold=True),
+        Scenario('posts.list', 'get', lambda i: f'/posts?page={i % 50 + 1}', cold=True),
+        Scenario('posts.list.cached', 'get', lambda i: '/posts?page=1'),
+        Scenario('posts.list.cursor', 'get', lambda i: '/posts?cursor=&pageSize=20',
+                 cold=True),
+        Scenario('posts.list.filtered', 'get',
+                 lambda i: '/posts?tags=Tag1&location=Seoul&startDate=2020-03-01', cold=True),
+        Scenario('posts.list.most_commented', 'get', lambda i: '/posts?ordering=-commentCount',
+                 cold=True),
+        Scenario('posts.search', 'get', lambda i: '/posts?q=post', cold=True),
+        Scenario('posts.retrieve', 'get', lambda i: f'/posts/{post}'),
+        Scenario('posts.retrieve.not_modified', 'get', lambda i: f'/posts/{post}',
+                 headers=etag),
+        Scenario('posts.create', 'post', lambda i: '/posts', data=post_data, auth=True),
+        Scenario('posts.batch_create', 'post', lambda i: '/posts/batch',
+                 data=lambda i: [post_data(i * 50 + j) for j in range(50)], auth=True),
+        Scenario('posts.partial_update', 'patch', lambda i: f'/posts/{own_posts[0]}',
+                 data=lambda i: {'title': f'Updated {i}', 'tags': ['Tag2']}, auth=True),
+        Scenario('comments.create', 'post', lambda i: '/posts/comments',
+                 data=lambda i: {'content': 'Benchmark', 'post': other_posts[i]}, auth=True),
+        Scenario('comments.update', 'put', lambda i: f'/posts/comments/{comments[0]}',
+                 data=lambda i: {'content': f'Updated {i}'}, auth=True),
+        Scenario('comments.destroy', 'delete', lambda i: f'/posts/comments/{comments[i]}',
+                 auth=True),
+        Scenario('posts.destroy', 'delete', lambda i: f'/posts/{own_posts[i]}', auth=True),
+        Scenario('moderation', 'post', lambda i: '/posts/moderation',
+                 data=lambda i: {'posts': [other_posts[-1 - i]]}, auth=True),
+
+        # user/routers.py
+        Scenario('auth.token', 'post', lambda i: '/user/auth/token',
+                 data=lambda i: credentials, limit=20),
+        Scenario('auth.token.refresh', 'post', lambda i: '/user/auth/token/refresh',
+                 data=lambda i: {'refresh': fixtures['refresh']}),
+        Scenario('auth.token.verify', 'post', lambda i: '/user/auth/token/verify',
+                 data=lambda i: {'token': fixtures['access']}),
+        Scenario('rest_auth.token.refresh', 'post', lambda i: '/user/auth/token/refresh/',
+                 data=lambda i: {'refresh': fixtures['refresh']}),
+        Scenario('rest_auth.token.verify', 'post', lambda i: '/user/auth/token/verify/',
+                 data=lambda i: {'token': fixtures['access']}),
+        Scenario('rest_auth.login', 'post', lambda i: '/user/auth/login/',
+                 data=lambda i: credentials, limit=20),
+        Scenario('rest_auth.user', 'get', lambda i: '/user/auth/user/', auth=True),
+        Scenario('rest_auth.user.update', 'patch', lambda i: '/user/auth/user/',
+                 data=lambda i: {'name': f'benchmark{i}'}, auth=True),
+        Scenario('rest_auth.password.change', 'post', lambda i: '/user/auth/password/change/',
+                 data=lambda i: {'new_password1': SEED_PASSWORD,
+                                 'new_password2': SEED_PASSWORD},
+                 auth=True, limit=20),
+        Scenario('rest_auth.password.reset', 'post', lambda i: '/user/auth/password/reset/',
+                 data=lambda i: {'email': user.email}, limit=20),
+        Scenario('rest_auth.password.reset.confirm', 'post',
+                 lambda i: '/user/auth/password/reset/confirm/', data=reset_data, limit=20),
+        Scenario('rest_auth.logout', 'post', lambda i: '/user/auth/logout/', auth=True),
+        Scenario('registration', 'post', lambda i: '/user/auth/registration/',
+                 data=lambda i: {'username': f'bench{i}', 'email': f'bench{i}@example.com',
+                                 'password1': SEED_PASSWORD, 'password2': SEED_PASSWORD},
+                 limit=20),
+        Scenario('registration.verify_email', 'post',
+                 lambda i: '/user/auth/registration/verify-email/',
+                 data=lambda i: {'key': keys[i]}),
+        Scenario('registration.account_confirm_email', 'get',
+                 lambda i: f'/user/auth/registration/account-confirm-email/{keys[i]}/'),
+        Scenario('verify_email', 'post', lambda i: '/user/dj-rest-auth/account-confirm-email/',
+                 data=lambda i: {'key': keys[half + i]}),
+        Scenario('confirm_email', 'get',
+                 lambda i: f'/user/auth/registration/confirm/{keys[half + i]}/'),
+
+        # photo/routers.py, which is included without a trailing slash.
+        Scenario('photos.list', 'get', lambda i: '/photos', auth=True),
+        Scenario('photos.create', 'post', lambda i: '/photos',
+                 data=lambda i: {'photo_category': 'benchmark', 'photo_detail': str(i),
+                                 'image': make_image()},
+                 format='multipart', auth=True),
+        Scenario('photos.retrieve', 'get', lambda i: f'/photos{photos[0]}/', auth=True),
+        Scenario('photos.update', 'put', lambda i: f'/photos{photos[0]}/',
+                 data=lambda i: {'photo_category': 'benchmark', 'photo_detail': str(i),
+                                 'image': make_image()},
+                 format='multipart', auth=True),
+        Scenario('photos.partial_update', 'patch', lambda i: f'/photos{photos[0]}/',
+                 data=lambda i: {'photo_detail': str(i)}, auth=True),
+        Scenario('photos.destroy', 'delete', lambda i: f'/photos{photos[i + 1]}/',
+                 auth=True),
+
+        # common/media.py
+        Scenario('media', 'get', lambda i: fixtures['image'].image.url),
+        Scenario('media.range', 'get', lambda i: fixtures['image'].image.url,
+                 headers=lambda i: {'HTTP_RANGE': 'bytes=0-1023'}),
+        Scenario('media.not_modified', 'get', lambda i: fixtures['image'].image.url,
+                 headers=lambda i: {'HTTP_IF_NONE_MATCH': fixtures['image_etag']}),
+    ]
+
+
+@contextmanager
+def count_queries() -> Iterator[List[int]]:
+    from django.db import connection
+
+    counter = [0]
+
+    def wrapper(execute: Callable[..., Any], *args: Any) -> Any:
+        counter[0] += 1
+        return execute(*args)
+
+    with connection.execute_wrapper(wrapper):
+        yield counter
+
+
+def run_scenario(scenario: Scenario, fixtures: Dict[str, Any],
+                 requests: int, warmup: int) -> Dict[str, Any]:
+    from django.core.cache import cache
+    from django.urls import resolve
+    from rest_framework.test import APIClient
+
+    client = APIClient(raise_request_exception=False)
+    total = min(requests, scenario.limit or requests)
+    latencies, queries, sizes = [], 0, 0
+    statuses: Dict[int, int] = {}
+
+    for i in range(warmup + total):
+        path = scenario.path(i)
+        kwargs: Dict[str, Any] = {'secure': True}
+        if scenario.data is not None:
+            kwargs.update(data=scenario.data(i), format=scenario.format)
+        if scenario.auth:
+            kwargs['HTTP_AUTHORIZATION'] = fixtures['token']
+        if scenario.headers is not None:
+            kwargs.update(scenario.headers(i))
+        if scenario.cold:
+            cache.clear()
+
+        with count_queries() as counter:
+            start = time.perf_counter()
+            response = getattr(client, scenario.method)(path, **kwargs)
+            elapsed = time.perf_counter() - start
+
+        if i < warmup:
+            continue
+        latencies.append(elapsed * 1000)
+        queries += counter[0]
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        sizes += len(b''.join(response)) if response.streaming else len(response.content)
+
+    latencies.sort()
+    return {
+        'name': scenario.name,
+        'method': scenario.method.upper(),
+        'route': resolve(path.split('?')[0]).route,
+        'requests': total,
+        'statuses': {str(code): count for code, count in sorted(statuses.items())},
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+        'mean_ms': sum(latencies) / total,
+        'queries_per_request': queries / total,
+        'bytes_per_request': sizes / total,
+        'throughput_rps': total / (sum(latencies) / 1000),
+    }
+
+
+def run(requests: int, warmup: int) -> Dict[str, Any]:
+    """
+    Request every route of the seeded database and summarize the results.
+    """
+    from django.core import mail
+
+    from photo import variants
+    from photo.models import photo
+
+    fixtures = prepare(requests + warmup)
+    mail.outbox = []
+
+    try:
+        results = [run_scenario(scenario, fixtures, requests, warmup)
+                   for scenario in make_scenarios(fixtures)]
+    finally:
+        # Remove the uploaded images and their variants from MEDIA_ROOT.
+        variants.shutdown()
+        default = photo._meta.get_field('image').default
+        for image in photo.objects.exclude(image=default):
+            for name in ('image', *variants.VARIANTS):
+                getattr(image, name).delete(save=False)
+
+    covered = {result['route'] for result in results}
+    return {
+        'results': results,
+        'skipped': [{'route': route, 'reason': reason} for route, reason in SKIPPED.items()],
+        'uncovered': [route for route in all_routes()
+                      if route not in covered and not route.startswith(tuple(SKIPPED))],
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class DisableMigrations:
+    """
+    Build the tables straight from the models like `pytest --nomigrations`.
+    """
+    def __contains__(self, item: str) -> bool:
+        return True
+
+    def __getitem__(self, item: str) -> None:
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', default='dev_up.settings')
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--posts', type=int, default=10000)
+    parser.add_argument('--comments-per-post', type=int, default=3)
+    parser.add_argument('--reply-depth', type=int, default=2)
+    parser.add_argument('--requests', type=int, default=200,
+                        help='requests per route after the warm-up')
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the results to this file instead of stdout')
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', args.settings)
+    import django
+    from django.conf import settings
+
+    django.setup()
+    settings.MIGRATION_MODULES = DisableMigrations()
+    settings.ALLOWED_HOSTS = ['testserver']
+
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test.runner import DiscoverRunner
+
+    runner = DiscoverRunner(verbosity=0, interactive=False)
+    runner.setup_test_environment()
+    databases = runner.setup_databases()
+    try:
+        seed_started = time.perf_counter()
+        call_command('seed', users=args.users, posts=args.posts,
+                     comments_per_post=args.comments_per_post, reply_depth=args.reply_depth,
+                     seed=args.seed, stdout=io.StringIO())
+        seed_seconds = time.perf_counter() - seed_started
+
+        report = {
+            'meta': {
+                'commit': git_commit(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'scale': {'users': args.users, 'posts': args.posts,
+                          'comments_per_post': args.comments_per_post,
+                          'reply_depth': args.reply_depth, 'seed': args.seed},
+                'requests': args.requests,
+                'warmup': args.warmup,
+                'seed_seconds': seed_seconds,
+            },
+            **run(args.requests, args.warmup),
+        }
+    finally:
+        runner.teardown_databases(databases)
+        runner.teardown_test_environment()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Show which filter combinations of `PostAPI.list` are answered with an index scan.
+
+The posts table is seeded up to `--posts` rows (1M by default) with bulk inserts
+before `EXPLAIN` runs on the first page of every combination.
+
+    $ python -m benchmarks.post_indexes --settings dev_up.settings --posts 1000000
+"""
+import argparse
+from itertools import combinations
+import json
+import os
+import re
+from typing import Any, Dict, List
+
+# How the posts table is accessed in PostgreSQL and SQLite plans.
+POSTS_ACCESS = re.compile(r'^[\d ]*(?:->)?\s*(.*\bpost_post\b(?!_).*)$', re.MULTILINE)
+INDEX_SCAN = re.compile(
+    r'Index Scan|Index Only Scan|USING (COVERING )?INDEX|USING INTEGER PRIMARY KEY')
+SORT = re.compile(r'\bSort\b|TEMP B-TREE FOR ORDER BY')
+
+FILTERS = {
+    'date': {'startDate': '2020-03-01', 'endDate': '2020-03-31'},
+    'timeOfDay': {'timeOfDay': '1'},
+    'category': {'category': 'Category 3'},
+    'location': {'location': 'Pangyo'},
+}
+
+
+def explain_filters(page_size: int) -> List[Dict[str, Any]]:
+    from django.http.request import QueryDict
+
+    from post.api.post import PostAPI
+
+    results = []
+    for size in range(len(FILTERS) + 1):
+        for names in combinations(FILTERS, size):
+            params = QueryDict(mutable=True)
+            for name in names:
+                params.update(FILTERS[name])
+
+            posts, ordering = PostAPI().filter_posts(params)
+            plan = posts.order_by(*ordering)[:page_size].explain()
+            access = POSTS_ACCESS.search(plan)
+            results.append({
+                'filters': list(names),
+                'access': access.group(1) if access else '',
+                'index_scan': bool(access and INDEX_SCAN.search(access.group(1))),
+                'sort': bool(SORT.search(plan)),
+                'plan': plan,
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', default='dev_up.settings')
+    parser.add_argument('--posts', type=int, default=1000000)
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', args.settings)
+    import django
+    django.setup()
+
+    from django.db import connection
+
+    from post.models import Post
+    from post.seeding import seed_posts
+
+    existing = Post.objects.count()
+    if existing < args.posts:
+        seed_posts(args.posts - existing, seed=existing)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+    results = explain_filters(args.page_size)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for result in results:
+        filters = ', '.join(result['filters']) or '(none)'
+        scan = 'index' if result['index_scan'] else 'scan'
+        sort = '+ sort' if result['sort'] else ''
+        print(f"{filters:<40} {scan:>5} {sort:<6}  {result['access']}")
+
+
+if __name__ == '__main__':
+    main()
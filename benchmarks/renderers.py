@@ -0,0 +1,113 @@
+"""
+Compare the JSON renderers and parsers on payloads shaped like the responses of
+`GET /posts?pageSize=50` and `GET /posts/<id>` with a tree of comments.
+
+Reports the mean time per call and the peak memory allocated by one call.
+
+    $ python -m benchmarks.renderers --number 2000
+"""
+import argparse
+from collections import OrderedDict
+import io
+import json
+import os
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+AUTHOR = OrderedDict([('id', 1), ('username', 'devvup'), ('email', 'devvup@example.com')])
+CATEGORY = OrderedDict([('id', 3), ('title', 'Study'), ('is_active', True)])
+
+
+def make_post(post_id: int) -> Dict[str, Any]:
+    return OrderedDict([
+        ('id', post_id),
+        ('title', f'주말 알고리즘 스터디 모집 {post_id}'),
+        ('content', '매주 토요일 판교에서 모여서 문제를 풉니다. ' * 10),
+        ('location', 'Pangyo'),
+        ('capacity', 10),
+        ('date', '2020-03-14'),
+        ('timeOfDay', 1),
+        ('createdDate', '2020-03-01T09:30:15.123456+09:00'),
+        ('author', AUTHOR),
+        ('category', CATEGORY),
+        ('tags', [OrderedDict([('id', i), ('title', f'tag{i}')]) for i in range(5)]),
+        ('commentCount', 12),
+    ])
+
+
+def make_comment(comment_id: int, replies: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return OrderedDict([
+        ('id', comment_id),
+        ('content', '참여하고 싶습니다! 아직 자리 있나요?'),
+        ('createdDate', '2020-03-02T10:00:00+09:00'),
+        ('author', AUTHOR),
+        ('replies', replies),
+    ])
+
+
+def make_payloads() -> Dict[str, Any]:
+    comments = [make_comment(i, [make_comment(i * 100 + j, []) for j in range(3)])
+                for i in range(30)]
+    return {
+        'list': [make_post(i) for i in range(50)],
+        'detail': {**make_post(1), 'comments': comments},
+    }
+
+
+def measure(func: Callable[[], Any], number: int) -> Dict[str, float]:
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    seconds = timeit.timeit(func, number=number)
+    return {'us_per_call': seconds / number * 1e6, 'peak_kib': peak / 1024}
+
+
+def run(number: int) -> List[Dict[str, Any]]:
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from common.parsers import FastJSONParser
+    from common.renderers import FastJSONRenderer
+
+    results: List[Dict[str, Any]] = []
+    for name, payload in make_payloads().items():
+        body = JSONRenderer().render(payload)
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            results.append({
+                'payload': name, 'operation': 'render', 'class': type(renderer).__name__,
+                **measure(lambda: renderer.render(payload), number),
+            })
+        for parser in (JSONParser(), FastJSONParser()):
+            results.append({
+                'payload': name, 'operation': 'parse', 'class': type(parser).__name__,
+                **measure(lambda: parser.parse(io.BytesIO(body)), number),
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', default='dev_up.settings')
+    parser.add_argument('--number', type=int, default=1000)
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', args.settings)
+    import django
+    django.setup()
+
+    results = run(args.number)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for result in results:
+        print(f"{result['payload']:<8} {result['operation']:<7} {result['class']:<18}"
+              f" {result['us_per_call']:>10.1f} us {result['peak_kib']:>10.1f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Compare the throughput of the read endpoints served by WSGI (gunicorn)
+and ASGI (uvicorn with `dev_up.asgi`) at growing numbers of connections.
+
+The servers run against the database of `--settings`, which must be migrated
+and seeded beforehand (see `manage.py seed`). Every connection sends requests
+one after another over keep-alive, and the results are printed as JSON.
+
+    $ python -m benchmarks.servers --settings dev_up.settings --connections 16 64 256
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.api import git_commit, percentile
+
+PATHS = ['/posts', '/posts?cursor=', '/posts/categories', '/posts/tags', '/posts/1']
+
+
+def server_command(kind: str, port: int, workers: int, threads: int) -> List[str]:
+    if kind == 'wsgi':
+        return [sys.executable, '-m', 'gunicorn', 'dev_up.wsgi:application',
+                '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+                '--threads', str(threads), '--log-level', 'warning']
+    return [sys.executable, '-m', 'uvicorn', 'dev_up.asgi:application',
+            '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers),
+            '--log-level', 'warning', '--no-access-log']
+
+
+def wait_for_port(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'The server did not listen on port {port}.')
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    """
+    Read an HTTP/1.1 response and return its status code.
+    """
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        name, separator, value = line.partition(':')
+        if separator:
+            headers[name.strip().lower()] = value.strip()
+
+    if headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get('content-length', 0)))
+    return status
+
+
+async def connection(port: int, paths: List[str], deadline: float,
+                     latencies: List[float], errors: List[int]) -> None:
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        i = 0
+        while time.monotonic() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            start = time.perf_counter()
+            writer.write(f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n'.encode())
+            status = await read_response(reader)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status >= 400:
+                errors.append(status)
+    except (OSError, asyncio.IncompleteReadError):
+        errors.append(0)
+    finally:
+        writer.close()
+
+
+async def load(port: int, paths: List[str], connections: int,
+               duration: float) -> Tuple[List[float], List[int]]:
+    latencies: List[float] = []
+    errors: List[int] = []
+    deadline = time.monotonic() + duration
+    await asyncio.gather(*[connection(port, paths, deadline, latencies, errors)
+                           for _ in range(connections)])
+    return latencies, errors
+
+
+def run(kind: str, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    process = subprocess.Popen(server_command(kind, args.port, args.workers, args.threads),
+                               env={**os.environ, 'DJANGO_SETTINGS_MODULE': args.settings})
+    try:
+        wait_for_port(args.port)
+        # Warm up the workers.
+        asyncio.run(load(args.port, args.paths, args.workers, 1.0))
+
+        results = []
+        for connections in args.connections:
+            latencies, errors = asyncio.run(load(args.port, args.paths, connections,
+                                                 args.duration))
+            latencies.sort()
+            results.append({
+                'server': kind,
+                'connections': connections,
+                'requests': len(latencies),
+                'errors': len(errors),
+                'throughput_rps': len(latencies) / args.duration,
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95),
+                'p99_ms': percentile(latencies, 99),
+            })
+        return results
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', default='dev_up.settings')
+    parser.add_argument('--connections', type=int, nargs='+', default=[16, 64, 256])
+    parser.add_argument('--duration', type=float, default=10.0,
+                        help='seconds of load for each number of connections')
+    parser.add_argument('--workers', type=int, default=1, help='processes of each server')
+    parser.add_argument('--threads', type=int, default=4,
+                        help='threads of each WSGI worker')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--paths', nargs='+', default=PATHS)
+    parser.add_argument('--output', help='write the results to this file instead of stdout')
+    args = parser.parse_args()
+
+    report = {
+        'meta': {'commit': git_commit(), 'settings': args.settings, 'workers': args.workers,
+                 'threads': args.threads, 'duration': args.duration, 'paths': args.paths},
+        'results': run('wsgi', args) + run('asgi', args),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+An ASGI handler which serves the read-only actions of ViewSets on a bounded thread pool.
+
+Django 3.0 has no async views and its ASGIHandler runs every request through
+`sync_to_async`, which runs them one at a time on a single thread. The actions
+listed in `async_actions` of a ViewSet are run concurrently on a pool of
+`ASYNC_READ_THREADS` threads instead, with at most `ASYNC_READ_CONCURRENCY`
+of them at once. A request that waits longer than `ASYNC_READ_QUEUE_TIMEOUT`
+seconds for its turn gets `503 Service Unavailable` and one which takes longer than
+`ASYNC_READ_TIMEOUT` seconds gets `504 Gateway Timeout`.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.db import close_old_connections
+from django.http import HttpRequest, JsonResponse
+from django.http.response import HttpResponseBase
+from django.urls import Resolver404, resolve
+
+
+def pooled_action(request: HttpRequest) -> Optional[str]:
+    """
+    The action of the ViewSet which the request is routed to
+    when it is one of the `async_actions` of the ViewSet, otherwise None.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return None
+
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return None
+
+    cls = getattr(match.func, 'cls', None)
+    action = (getattr(match.func, 'actions', None) or {}).get('get')
+    if action is not None and action in getattr(cls, 'async_actions', ()):
+        return action
+    return None
+
+
+class PooledReadASGIHandler(ASGIHandler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.executor = ThreadPoolExecutor(max_workers=settings.ASYNC_READ_THREADS,
+                                           thread_name_prefix='async-read')
+        self.semaphore: Optional[asyncio.Semaphore] = None
+
+    def _respond(self, request: HttpRequest) -> HttpResponseBase:
+        # The connections of the pool threads are closed like the ones of request threads.
+        close_old_connections()
+        try:
+            return super().get_response(request)
+        finally:
+            close_old_connections()
+
+    async def get_response(self, request: HttpRequest) -> HttpResponseBase:
+        if pooled_action(request) is None:
+            return await sync_to_async(super().get_response)(request)
+
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(settings.ASYNC_READ_CONCURRENCY)
+        semaphore = self.semaphore
+
+        try:
+            await asyncio.wait_for(semaphore.acquire(), settings.ASYNC_READ_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            response = JsonResponse({'detail': 'The server is busy.'}, status=503)
+            response['Retry-After'] = '1'
+            return response
+
+        loop = asyncio.get_running_loop()
+        future: 'asyncio.Future[HttpResponseBase]' = asyncio.ensure_future(
+            loop.run_in_executor(self.executor, self._respond, request))
+        # A thread can't be stopped, so the slot is freed when it finishes even after a timeout.
+        future.add_done_callback(lambda _: semaphore.release())
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), settings.ASYNC_READ_TIMEOUT)
+        except asyncio.TimeoutError:
+            return JsonResponse({'detail': 'The request timed out.'}, status=504)
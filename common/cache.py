@@ -0,0 +1,62 @@
+import hashlib
+import json
+from typing import Any, Callable, Optional
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.http import HttpResponse
+from django.http.response import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from common.metrics import record_cache_lookup
+
+
+def make_etag(data: Any) -> str:
+    """
+    A strong ETag of JSON-serializable data.
+    """
+    content = json.dumps(data, cls=JSONEncoder, sort_keys=True, separators=(',', ':'))
+    return quote_etag(hashlib.md5(content.encode()).hexdigest())
+
+
+def not_modified(request: Request,
+                 etag: Optional[str] = None,
+                 last_modified: Optional[int] = None) -> Optional[HttpResponseBase]:
+    """
+    Return `304 Not Modified` (or `412 Precondition Failed`) when the conditional headers
+    of the request (`If-None-Match`, `If-Modified-Since`, ...) are satisfied by
+    the ETag and the last modified timestamp of the resource, otherwise None.
+    """
+    headers = HttpResponse()
+    if etag is not None:
+        headers['ETag'] = etag
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified)
+
+    response = get_conditional_response(request._request, etag=etag, last_modified=last_modified,
+                                        response=headers)
+    return None if response is headers else response
+
+
+def cached_response(request: Request, key: str, build: Callable[[], Any],
+                    timeout: Any = DEFAULT_TIMEOUT) -> HttpResponseBase:
+    """
+    Serve the data built by `build` from the cache with its ETag,
+    answering `If-None-Match` with `304 Not Modified` without a body.
+
+        Example:
+        >>> cached_response(request, 'post:tags', lambda: TagSerializer(tags, many=True).data)
+    """
+    entry = cache.get(key)
+    record_cache_lookup(key, hit=entry is not None)
+    if entry is None:
+        data = build()
+        entry = (make_etag(data), data)
+        cache.set(key, entry, timeout)
+
+    etag, data = entry
+    return not_modified(request, etag=etag) or Response(data, headers={'ETag': etag})
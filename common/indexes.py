@@ -0,0 +1,19 @@
+from typing import Type
+
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.backends.ddl_references import Statement
+
+
+class PortableGinIndex(GinIndex):
+    """
+    A GIN index on PostgreSQL and a plain index on other databases (e.g. SQLite for tests),
+    so that models which use PostgreSQL-only columns can still be created anywhere.
+    """
+
+    def create_sql(self, model: Type[models.Model], schema_editor: BaseDatabaseSchemaEditor,
+                   using: str = '') -> Statement:
+        if schema_editor.connection.vendor == 'postgresql':
+            return super().create_sql(model, schema_editor, using=using)
+        return models.Index.create_sql(self, model, schema_editor, using=using)
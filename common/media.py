@@ -0,0 +1,194 @@
+"""
+Serving of the uploaded files in MEDIA_ROOT.
+
+Files are served with an `ETag`, `Last-Modified` and long-lived `Cache-Control`,
+answer conditional requests with `304 Not Modified`, and a single `Range` with
+`206 Partial Content`.
+
+When `MEDIA_SENDFILE` is set, the response only tells the front proxy which file
+to send, so the worker is free as soon as the headers are written:
+
+- `x-accel-redirect` for nginx, with an `internal` location at `MEDIA_SENDFILE_PREFIX`
+  whose `alias` is MEDIA_ROOT.
+- `x-sendfile` for Apache (mod_xsendfile) and lighttpd, with the absolute path.
+
+Otherwise the file is returned as a `FileResponse`, which servers with
+`wsgi.file_wrapper` (e.g. gunicorn) send with `os.sendfile` without copying it through Python.
+"""
+import mimetypes
+import os
+import re
+import stat
+from typing import IO, Optional, Tuple
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.handlers.wsgi import WSGIRequest
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse
+from django.http.response import HttpResponseBase
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from photo.storage import INCOMING_DIR
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class UnsatisfiableRange(Exception):
+    pass
+
+
+class FileRange:
+    """
+    A file-like object which reads at most `length` bytes of a file from its current position.
+
+    It keeps `fileno` and `tell` of the file, so that servers sending files with
+    `os.sendfile` still do so for ranges, limited to the `Content-Length` of the response.
+    """
+    def __init__(self, file: IO[bytes], length: int) -> None:
+        self.file = file
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self) -> int:
+        return self.file.fileno()
+
+    def tell(self) -> int:
+        return self.file.tell()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    The first and the last byte of a file of `size` bytes requested by a `Range` header.
+    Headers which are malformed or request several ranges are ignored with None,
+    and ranges which start after the end of the file raise UnsatisfiableRange.
+
+        Example:
+        >>> parse_range('bytes=0-99', 1000)
+        (0, 99)
+        >>> parse_range('bytes=900-', 1000)
+        (900, 999)
+        >>> parse_range('bytes=-100', 1000)
+        (900, 999)
+    """
+    match = RANGE_RE.match(header.strip())
+    if match is None:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # The last `last` bytes.
+        if int(last) == 0 or size == 0:
+            raise UnsatisfiableRange
+        return max(size - int(last), 0), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise UnsatisfiableRange
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def file_etag(status: os.stat_result) -> str:
+    return f'"{status.st_size:x}-{status.st_mtime_ns:x}"'
+
+
+def range_applies(request: HttpRequest, etag: str, last_modified: int) -> bool:
+    """
+    Whether the `If-Range` precondition, if any, holds for the current version of the file.
+    """
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        # Weak validators never match in If-Range.
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def _file_response(request: HttpRequest, fullpath: str, path: str, size: int,
+                   etag: str, last_modified: int) -> HttpResponseBase:
+    content_type, encoding = mimetypes.guess_type(fullpath)
+    if content_type is None or encoding is not None:
+        # e.g. `.tar.gz` would otherwise be served as a tar which browsers have to decompress.
+        content_type = 'application/octet-stream'
+
+    response: HttpResponseBase
+    if settings.MEDIA_SENDFILE == 'x-accel-redirect':
+        # nginx answers the Range and the conditional headers itself.
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = settings.MEDIA_SENDFILE_PREFIX + quote(path)
+        return response
+    if settings.MEDIA_SENDFILE == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = fullpath
+        return response
+
+    byte_range = None
+    if 'HTTP_RANGE' in request.META and range_applies(request, etag, last_modified):
+        try:
+            byte_range = parse_range(request.META['HTTP_RANGE'], size)
+        except UnsatisfiableRange:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    file = open(fullpath, 'rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, end = byte_range
+        file.seek(start)
+        response = FileResponse(FileRange(file, end - start + 1), status=206,
+                                content_type=content_type)
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+
+@require_safe
+def serve_media(request: WSGIRequest, path: str) -> HttpResponseBase:
+    """
+    Serve a file of MEDIA_ROOT, e.g. `/media/images/2020/07/01/banner.jpg`.
+
+    The uploads which are still being written to `.incoming` are never served.
+    """
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+        status = os.stat(fullpath)
+    except (SuspiciousFileOperation, OSError, ValueError):
+        raise Http404
+    relative = os.path.relpath(fullpath, settings.MEDIA_ROOT)
+    if not stat.S_ISREG(status.st_mode) or relative.split(os.sep)[0] == INCOMING_DIR:
+        raise Http404
+
+    etag = file_etag(status)
+    last_modified = int(status.st_mtime)
+    response: Optional[HttpResponseBase] = get_conditional_response(
+        request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = _file_response(request, fullpath, path, status.st_size, etag, last_modified)
+
+    if response.status_code != 416:
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Accept-Ranges'] = 'bytes'
+        patch_cache_control(response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE)
+    return response
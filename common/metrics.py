@@ -0,0 +1,143 @@
+"""
+Request metrics in the Prometheus text format.
+
+Every worker process records its metrics with `prometheus_client`, whose values
+are guarded by a lock per labelled value only. When the server runs several
+worker processes, point `PROMETHEUS_MULTIPROC_DIR` to an empty directory
+before the workers start so that every process writes its values to memory-mapped
+files in there, and `/metrics` sums them up whichever process serves it.
+
+`/metrics` answers staff users and the addresses in `METRICS_ALLOWED_IPS` only.
+The address is the `REMOTE_ADDR` of the request, so behind a proxy either let
+Prometheus scrape the workers directly or keep `/metrics` off the proxy.
+"""
+from ipaddress import ip_address, ip_network
+import os
+import time
+from typing import Any, Callable, Dict, Optional, cast
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import connection
+from django.http import HttpRequest, HttpResponse
+from django.http.response import HttpResponseBase
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter,
+                               Histogram, generate_latest, multiprocess)
+
+# Labels of the requests that don't reach a view, e.g. `404 Not Found` from the URL resolver.
+UNRESOLVED = '<unresolved>'
+
+LATENCY_BUCKETS = (.005, .01, .025, .05, .075, .1, .25, .5, .75, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+REQUESTS = Counter('http_requests', 'Requests by view and status.',
+                   ['view', 'method', 'status'])
+LATENCY = Histogram('http_request_duration_seconds', 'Time to respond to a request.',
+                    ['view', 'method'], buckets=LATENCY_BUCKETS)
+DB_QUERIES = Histogram('http_request_db_queries', 'Database queries per request.',
+                       ['view', 'method'], buckets=QUERY_BUCKETS)
+DB_TIME = Histogram('http_request_db_duration_seconds', 'Time in the database per request.',
+                    ['view', 'method'], buckets=LATENCY_BUCKETS)
+RESPONSE_SIZE = Histogram('http_response_size_bytes', 'Size of response bodies.',
+                          ['view', 'method'], buckets=SIZE_BUCKETS)
+# `prometheus_client` has no type hints.
+collect_processes = cast(Callable[[CollectorRegistry], Any], multiprocess.MultiProcessCollector)
+
+CACHE_LOOKUPS = Counter('cache_lookups', 'Lookups of cached responses by result.',
+                        ['cache', 'result'])
+
+
+def view_name(view_func: Callable[..., Any], method: str) -> str:
+    """
+    Name a view by its class and the action of the ViewSet if any.
+
+        Example:
+        >>> view_name(PostAPI.as_view({'get': 'list'}), 'GET')
+        'PostAPI.list'
+    """
+    # DRF views keep their class in `cls` and Django views in `view_class`.
+    cls = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    if cls is None:
+        return f'{view_func.__module__}.{view_func.__name__}'
+
+    actions: Dict[str, str] = getattr(view_func, 'actions', None) or {}
+    if method.lower() in actions:
+        return f'{cls.__name__}.{actions[method.lower()]}'
+    return cls.__name__
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(cache=cache, result='hit' if hit else 'miss').inc()
+
+
+class MetricsMiddleware:
+    """
+    Record the latency, the database queries and time, and the size of the response
+    of every request labelled by its view.
+    """
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        queries = {'count': 0, 'seconds': 0.0}
+
+        def count_query(execute: Callable[..., Any], *args: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return execute(*args)
+            finally:
+                queries['count'] += 1
+                queries['seconds'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        with connection.execute_wrapper(count_query):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        view = getattr(request, '_metrics_view', UNRESOLVED)
+        labels = {'view': view, 'method': request.method or ''}
+        REQUESTS.labels(status=str(response.status_code), **labels).inc()
+        LATENCY.labels(**labels).observe(duration)
+        DB_QUERIES.labels(**labels).observe(queries['count'])
+        DB_TIME.labels(**labels).observe(queries['seconds'])
+        size = self._size(response)
+        if size is not None:
+            RESPONSE_SIZE.labels(**labels).observe(size)
+        return response
+
+    def process_view(self, request: HttpRequest, view_func: Callable[..., Any],
+                     view_args: Any, view_kwargs: Any) -> None:
+        request._metrics_view = view_name(view_func, request.method or '')  # type: ignore
+
+    def _size(self, response: HttpResponseBase) -> Optional[int]:
+        if isinstance(response, HttpResponse):
+            return len(response.content)
+        if response.has_header('Content-Length'):
+            return int(response['Content-Length'])
+        return None
+
+
+def metrics_allowed(request: HttpRequest) -> bool:
+    if request.user.is_staff:
+        return True
+    try:
+        address = ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(address in ip_network(network, strict=False)
+               for network in settings.METRICS_ALLOWED_IPS)
+
+
+def metrics(request: HttpRequest) -> HttpResponse:
+    """
+    Expose the metrics of all the worker processes in the Prometheus text format.
+    """
+    if not metrics_allowed(request):
+        raise PermissionDenied
+
+    registry = REGISTRY
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        collect_processes(registry)
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
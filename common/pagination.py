@@ -0,0 +1,184 @@
+import base64
+import binascii
+import json
+import math
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, TypeVar
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import models
+from django.db.backends.base.operations import BaseDatabaseOperations
+from django.db.models import Q
+from django.db.models.query import QuerySet
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.urls import replace_query_param
+
+T = TypeVar('T', bound=models.Model)
+
+
+class Cursor(NamedTuple):
+    """
+    A position in an ordered queryset.
+
+    `position` holds the values of the ordering fields of the boundary row
+    and `reverse` tells whether the rows before that position are requested.
+    """
+    position: List[Any]
+    reverse: bool = False
+
+
+class CursorPage(NamedTuple):
+    items: List[Any]
+    next: Optional[Cursor]
+    prev: Optional[Cursor]
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """
+        Example:
+        >>> encode_cursor(Cursor(position=[42]))
+        'eyJwIjpbNDJdLCJyIjpmYWxzZX0'
+    """
+    raw = json.dumps({'p': cursor.position, 'r': cursor.reverse}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str) -> Cursor:
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        data = json.loads(raw)
+        position, reverse = data['p'], data['r']
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ParseError(detail='Invalid cursor.')
+
+    if not isinstance(position, list) or not isinstance(reverse, bool):
+        raise ParseError(detail='Invalid cursor.')
+    return Cursor(position=position, reverse=reverse)
+
+
+def cursor_links(url: str, next_cursor: Optional[str],
+                 prev_cursor: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    The URLs of the next and the previous pages, which are the URL of the request
+    with `cursor` set to the encoded cursors, or None where there is no such page.
+    """
+    return {name: replace_query_param(url, 'cursor', cursor) if cursor is not None else None
+            for name, cursor in (('next', next_cursor), ('prev', prev_cursor))}
+
+
+def _flip(field: str) -> str:
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+def _keyset_filter(ordering: Sequence[str], position: Sequence[Any]) -> Q:
+    """
+    Build `(a, b) > (x, y)` as `a > x OR (a = x AND b > y)`
+    honoring the direction of each ordering field.
+    """
+    condition = Q()
+    equal: Dict[str, Any] = {}
+    for field, value in zip(ordering, position):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= Q(**equal, **{f'{name}__{lookup}': value})
+        equal[name] = value
+    return condition
+
+
+def _check_range(field: Any, value: Any) -> None:
+    """
+    Raise ValueError for a value which no row can have and the database may not take,
+    e.g. an integer beyond 64 bits on SQLite.
+    """
+    if isinstance(value, float) and not math.isfinite(value):
+        raise ValueError(f'{value} is not finite.')
+    if isinstance(field, models.IntegerField):
+        # The ranges of the columns that Django creates, which SQLite doesn't report.
+        ranges = BaseDatabaseOperations.integer_field_ranges
+        low, high = ranges.get(field.get_internal_type(), ranges['BigIntegerField'])
+        if not low <= value <= high:
+            raise ValueError(f'{value} is out of range.')
+
+
+def _cursor_position(queryset: 'QuerySet[T]', ordering: Sequence[str],
+                     position: Sequence[Any]) -> List[Any]:
+    """
+    Convert the values of a cursor, which come from the client, to the types of
+    the ordering fields, so that a forged cursor can't reach the query.
+    """
+    if len(position) != len(ordering):
+        raise ParseError(detail='Invalid cursor.')
+
+    values = []
+    for field, value in zip(ordering, position):
+        name = field.lstrip('-')
+        annotation = queryset.query.annotations.get(name)
+        try:
+            if value is None:
+                raise ValueError(f'{name} is null.')
+            if annotation is not None:
+                model_field = annotation.output_field
+            else:
+                model_field = queryset.model._meta.get_field(name)
+            value = model_field.to_python(value)
+            _check_range(model_field, value)
+        except (ValueError, TypeError, ValidationError, FieldDoesNotExist):
+            raise ParseError(detail='Invalid cursor.')
+        values.append(value)
+    return values
+
+
+def paginate_by_cursor(queryset: 'QuerySet[T]',
+                       ordering: Sequence[str],
+                       cursor: Optional[Cursor],
+                       page_size: int) -> CursorPage:
+    """
+    Slice a page out of the queryset with `WHERE (ordering) > (cursor)`
+    instead of `OFFSET`, so that the cost does not grow with the depth of the page
+    and no `COUNT(*)` is needed.
+
+    The last ordering field must be unique (e.g. `id`).
+    Both model instances and `values()` rows can be paginated.
+
+        Example:
+        >>> paginate_by_cursor(Post.objects.all(), ['id'], decode_cursor(token), 20)
+    """
+    if page_size < 1:
+        raise ParseError(detail='Page size should be positive.')
+
+    reverse = cursor is not None and cursor.reverse
+    order = [_flip(field) for field in ordering] if reverse else list(ordering)
+
+    qs = queryset.order_by(*order)
+    if cursor is not None:
+        qs = qs.filter(_keyset_filter(order, _cursor_position(queryset, ordering,
+                                                              cursor.position)))
+
+    rows = list(qs[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if reverse:
+        rows.reverse()
+
+    def position_of(row: Any) -> List[Any]:
+        names = [field.lstrip('-') for field in ordering]
+        if isinstance(row, dict):
+            return [row[name] for name in names]
+        return [getattr(row, name) for name in names]
+
+    if rows:
+        first, last = position_of(rows[0]), position_of(rows[-1])
+    elif cursor is not None:
+        first = last = cursor.position
+    else:
+        return CursorPage(items=[], next=None, prev=None)
+
+    if reverse:
+        has_next, has_prev = cursor is not None, has_more
+    else:
+        has_next, has_prev = has_more, cursor is not None
+
+    return CursorPage(
+        items=rows,
+        next=Cursor(position=last) if has_next else None,
+        prev=Cursor(position=first, reverse=True) if has_prev else None,
+    )
@@ -0,0 +1,34 @@
+import codecs
+import importlib
+from typing import IO, Any, Mapping, Optional
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from common.renderers import FastJSONRenderer
+
+orjson: Any
+try:
+    orjson = importlib.import_module('orjson')
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class FastJSONParser(JSONParser):
+    """
+    A JSONParser which decodes UTF-8 bodies with orjson when it is installed
+    and falls back to JSONParser otherwise.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream: IO[Any], media_type: Optional[str] = None,
+              parser_context: Optional[Mapping[str, Any]] = None) -> Any:
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
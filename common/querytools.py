@@ -1,20 +1,23 @@
-from typing import Any, Dict, Type, TypeVar, Union
+from typing import Any, Dict, List, Type, TypeVar, Union
 
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import models
+from django.db import connection, models
 from django.db.models.query import QuerySet
 from rest_framework.exceptions import NotFound
 
 T = TypeVar('T', bound=models.Model)
 
 
-def get_one(model: Type[T], *args: Any, **kwargs: Any) -> T:
+def get_one(target: Union[Type[T], 'QuerySet[T]'], *args: Any, **kwargs: Any) -> T:
     """
         Example:
         >>> get_one(Category, title="test")
+        or
+        >>> get_one(Post.objects.select_related('author'), id=1)
     """
+    qs = target if isinstance(target, QuerySet) else target.objects.all()
     try:
-        return model.objects.get(*args, **kwargs)
+        return qs.get(*args, **kwargs)
     except ObjectDoesNotExist:
         raise NotFound
 
@@ -37,3 +40,30 @@ def filter_exists(target: Union[Type[T], 'QuerySet[T]'],
         if v in options:
             filters[k] = options[v]
     return qs.filter(**filters)
+
+
+def last_ids(model: Type[models.Model], count: int) -> List[Any]:
+    """
+    The primary keys of the `count` rows inserted last, in insertion order,
+    for the databases on which `bulk_create` doesn't set them.
+    """
+    return sorted(model.objects.order_by('-pk').values_list('pk', flat=True)[:count])
+
+
+def bulk_create_with_ids(model: Type[T], objs: List[T]) -> List[T]:
+    """
+    Insert the objects with `bulk_create` and set their primary keys
+    even on databases which can't return them from a bulk insert.
+
+    It must be called in a transaction: there the inserted rows are the last ones
+    because SQLite allows a single writer at a time.
+
+        Example:
+        >>> with transaction.atomic():
+        ...     posts = bulk_create_with_ids(Post, [Post(title='a', ...), Post(title='b', ...)])
+    """
+    objs = model.objects.bulk_create(objs)
+    if objs and not connection.features.can_return_rows_from_bulk_insert:
+        for obj, pk in zip(objs, last_ids(model, len(objs))):
+            obj.pk = pk
+    return objs
@@ -0,0 +1,45 @@
+import importlib
+from typing import Any, Mapping, Optional
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# The module or None, typed as Any since `ModuleType` has no attributes for mypy.
+orjson: Any
+try:
+    orjson = importlib.import_module('orjson')
+except ImportError:  # pragma: no cover
+    orjson = None
+
+_encoder = JSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    A JSONRenderer which encodes with orjson when it is installed.
+
+    Types that orjson doesn't know (Decimal, timedelta, lazy strings, querysets, ...)
+    go through DRF's JSONEncoder, so the output matches JSONRenderer.
+    It falls back to JSONRenderer when orjson is missing, an indented output
+    is requested (e.g. by the browsable API) or orjson can't encode the data.
+
+    Unlike JSONRenderer, which raises ValueError for NaN and infinities with `STRICT_JSON`,
+    orjson renders them as `null`, which is still valid JSON.
+    """
+
+    def render(self, data: Any, accepted_media_type: Optional[str] = None,
+               renderer_context: Optional[Mapping[str, Any]] = None) -> bytes:
+        indent = self.get_indent(accepted_media_type or '', renderer_context or {})
+        if orjson is None or data is None or indent is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_encoder.default,
+                               option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escape \u2028 and \u2029 like JSONRenderer to keep the output a javascript subset.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
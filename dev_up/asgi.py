@@ -9,8 +9,13 @@ https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dev_up.settings')
 
-application = get_asgi_application()
+django.setup(set_prefix=False)
+
+# Serve the read-only actions on a thread pool (see common/asgi.py).
+from common.asgi import PooledReadASGIHandler  # noqa: E402 isort:skip
+
+application = PooledReadASGIHandler()
@@ -47,6 +47,7 @@ INSTALLED_APPS = [
     'post',
     'user',
     'photo',
+    'jobs',
     'django.contrib.sites',
     'allauth',
     'allauth.account',
@@ -108,6 +109,7 @@ JWT_AUTH_SECURE = os.environ.get("JWT_AUTH_SECURE", False)
 JWT_AUTH_SAMESITE = None
 
 MIDDLEWARE = [
+    'common.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -145,7 +147,10 @@ AUTHENTICATION_BACKENDS = (
 
 WSGI_APPLICATION = 'dev_up.wsgi.application'
 
-EMAIL_BACKEND = os.environ.get("EMAIL_BACKEND", 'django.core.mail.backends.smtp.EmailBackend')
+# Emails are sent by `manage.py run_jobs` with JOB_EMAIL_BACKEND (see jobs/mail.py).
+EMAIL_BACKEND = os.environ.get("EMAIL_BACKEND", 'jobs.mail.QueuedEmailBackend')
+JOB_EMAIL_BACKEND = os.environ.get("JOB_EMAIL_BACKEND",
+                                   'django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = os.environ.get("EMAIL_HOST", 'smtp.gmail.com')
 EMAIL_HOST_USER = os.environ.get("EMAIL_HOST_USER", '')
 EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD", '')
@@ -161,6 +166,16 @@ REST_FRAMEWORK = {
         'dj_rest_auth.jwt_auth.JWTCookieAuthentication',
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    # orjson-based JSON with a fallback to the standard library when it isn't installed.
+    'DEFAULT_RENDERER_CLASSES': (
+        'common.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'common.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SIMPLE_JWT = {
@@ -198,6 +213,44 @@ DATABASES = {
     }
 }
 
+# Read-only actions served on a thread pool by dev_up.asgi (see common/asgi.py)
+
+ASYNC_READ_THREADS = int(os.environ.get('ASYNC_READ_THREADS', 32))
+ASYNC_READ_CONCURRENCY = int(os.environ.get('ASYNC_READ_CONCURRENCY', 32))
+ASYNC_READ_QUEUE_TIMEOUT = float(os.environ.get('ASYNC_READ_QUEUE_TIMEOUT', 5))
+ASYNC_READ_TIMEOUT = float(os.environ.get('ASYNC_READ_TIMEOUT', 30))
+
+# Metrics (see common/metrics.py)
+
+# Addresses and networks besides staff users which may read /metrics, e.g. '10.0.0.0/8'.
+METRICS_ALLOWED_IPS = [network for network
+                       in os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
+                       if network]
+
+# Jobs (see jobs/queue.py)
+
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 5))
+JOB_RETRY_BACKOFF = float(os.environ.get('JOB_RETRY_BACKOFF', 10))
+JOB_RETRY_BACKOFF_MAX = float(os.environ.get('JOB_RETRY_BACKOFF_MAX', 60 * 60))
+JOB_LOCK_TIMEOUT = float(os.environ.get('JOB_LOCK_TIMEOUT', 10 * 60))
+
+# Cache
+# https://docs.djangoproject.com/en/3.0/topics/cache/
+#
+# The cached post, category and tag lists and their ETags are invalidated by signals
+# in the process which handles the write. LocMemCache is per process, so with more
+# than one worker CACHE_BACKEND must be a cache that the workers share, e.g.
+# 'django.core.cache.backends.memcached.MemcachedCache' with CACHE_LOCATION, or
+# 'django.core.cache.backends.db.DatabaseCache' with a table created by `createcachetable`.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND',
+                                  'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
@@ -246,3 +299,16 @@ APPEND_SLASH = False
 MEDIA_URL = '/media/'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Media files (see common/media.py)
+
+MEDIA_CACHE_MAX_AGE = int(os.environ.get('MEDIA_CACHE_MAX_AGE', 60 * 60 * 24 * 365))
+# 'x-accel-redirect' (nginx) or 'x-sendfile' (Apache, lighttpd) to let the proxy send the files.
+MEDIA_SENDFILE = os.environ.get('MEDIA_SENDFILE')
+MEDIA_SENDFILE_PREFIX = os.environ.get('MEDIA_SENDFILE_PREFIX', '/protected-media/')
+
+# Photo uploads (see photo/validators.py and photo/variants.py)
+
+PHOTO_MAX_UPLOAD_SIZE = int(os.environ.get('PHOTO_MAX_UPLOAD_SIZE', 10 * 1024 * 1024))
+PHOTO_MAX_PIXELS = int(os.environ.get('PHOTO_MAX_PIXELS', 40_000_000))
+PHOTO_VARIANT_WORKERS = int(os.environ.get('PHOTO_VARIANT_WORKERS', 2))
@@ -13,11 +13,17 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+import re
+
+from django.conf import settings
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
 
+from common.media import serve_media
+from common.metrics import metrics
+
 schema_view = get_schema_view(
     openapi.Info(
         title="Dev-Up API",
@@ -38,4 +44,7 @@ urlpatterns = [
     path('user/', include('user.routers')),
     path('posts', include('post.routers')),
     path('photos', include('photo.routers')),
+    path('metrics', metrics, name='metrics'),
+    re_path(r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/')), serve_media,
+            name='media'),
 ]
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    name = 'jobs'
+
+    def ready(self) -> None:
+        # Register the tasks which are defined in the app.
+        import jobs.mail  # noqa: F401
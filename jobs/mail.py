@@ -0,0 +1,75 @@
+"""
+Sending of emails in jobs, so that requests don't wait for the mail server.
+
+    EMAIL_BACKEND = 'jobs.mail.QueuedEmailBackend'
+    JOB_EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+"""
+import base64
+from typing import Any, Dict, Iterable, List
+
+from django.conf import settings
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from jobs.queue import task
+
+
+def serialize_message(message: EmailMessage) -> Dict[str, Any]:
+    """
+    The fields of an email as JSON. Attachments given as MIME objects aren't supported.
+    """
+    attachments = []
+    for attachment in message.attachments:
+        if not isinstance(attachment, tuple):
+            raise TypeError('Only attachments of (filename, content, mimetype) can be queued.')
+        filename, content, mimetype = attachment
+        if isinstance(content, bytes):
+            content = {'base64': base64.b64encode(content).decode()}
+        attachments.append([filename, content, mimetype])
+
+    return {
+        'subject': message.subject,
+        'body': message.body,
+        'from_email': message.from_email,
+        'to': message.to,
+        'cc': message.cc,
+        'bcc': message.bcc,
+        'reply_to': message.reply_to,
+        'headers': message.extra_headers,
+        'content_subtype': message.content_subtype,
+        'alternatives': getattr(message, 'alternatives', []),
+        'attachments': attachments,
+    }
+
+
+def deserialize_message(data: Dict[str, Any]) -> EmailMultiAlternatives:
+    attachments = []
+    for filename, content, mimetype in data['attachments']:
+        if isinstance(content, dict):
+            content = base64.b64decode(content['base64'])
+        attachments.append((filename, content, mimetype))
+
+    message = EmailMultiAlternatives(
+        subject=data['subject'], body=data['body'], from_email=data['from_email'],
+        to=data['to'], cc=data['cc'], bcc=data['bcc'], reply_to=data['reply_to'],
+        headers=data['headers'], attachments=attachments,
+        alternatives=[(content, mimetype) for content, mimetype in data['alternatives']],
+    )
+    message.content_subtype = data['content_subtype']
+    return message
+
+
+@task()
+def send_email(data: Dict[str, Any]) -> None:
+    # Errors are raised, so that the job is retried.
+    connection = get_connection(settings.JOB_EMAIL_BACKEND, fail_silently=False)
+    connection.send_messages([deserialize_message(data)])
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages: Iterable[EmailMessage]) -> int:
+        messages: List[Dict[str, Any]] = [serialize_message(message)
+                                          for message in email_messages]
+        for data in messages:
+            send_email.delay(data)
+        return len(messages)
@@ -0,0 +1,36 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import close_old_connections
+
+from jobs.queue import run_pending
+
+
+class Command(BaseCommand):
+    help = 'Run the queued jobs, waiting for new ones unless --once is given.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--batch-size', type=int, default=10,
+                            help='jobs claimed at once')
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='seconds to wait when no job is due')
+        parser.add_argument('--once', action='store_true',
+                            help='exit once no job is due')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        ran = 0
+        try:
+            while True:
+                # Like a request, every batch gets a usable connection.
+                close_old_connections()
+                count = run_pending(options['batch_size'])
+                ran += count
+                if count:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(f'Ran {ran} jobs.')
@@ -0,0 +1,34 @@
+from django.db import models
+from django.utils import timezone
+
+
+# Create your models here.
+class Job(models.Model):
+    """
+    A call of a task registered with `jobs.queue.task`, which `manage.py run_jobs` runs.
+    Jobs are deleted once they succeed and kept as failed after their last attempt.
+    """
+    class Status(models.TextChoices):
+        QUEUED = 'queued'
+        RUNNING = 'running'
+        FAILED = 'failed'
+
+    task = models.CharField(max_length=200)
+    # JSON of `{"args": [...], "kwargs": {...}}`.
+    arguments = models.TextField()
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # Workers claim the queued jobs which are due, the earliest first.
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'Job(task="{self.task}", status="{self.status}", attempts={self.attempts})'
@@ -0,0 +1,140 @@
+"""
+A job queue in the database, which needs no broker.
+
+Tasks are functions registered with `@task`, and `a_task.delay(*args, **kwargs)` inserts a job
+in the current transaction, so that the job only runs if the transaction commits.
+Workers (`manage.py run_jobs`) claim due jobs with `SELECT ... FOR UPDATE SKIP LOCKED`,
+so any number of them can run side by side without taking the same job.
+A job which raises is retried after an exponential backoff until its `max_attempts`,
+and the job of a worker which died is claimed again after `JOB_LOCK_TIMEOUT` seconds.
+
+The arguments of tasks must be serializable to JSON.
+"""
+from datetime import datetime, timedelta
+import json
+import logging
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from jobs.models import Job
+
+logger = logging.getLogger(__name__)
+
+TASKS: Dict[str, 'Task'] = {}
+
+
+class Task:
+    def __init__(self, func: Callable[..., Any], name: str,
+                 max_attempts: Optional[int]) -> None:
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args: Any, **kwargs: Any) -> Job:
+        """
+        Queue a call of the task with the arguments.
+
+            Example:
+            >>> send_email.delay({'subject': 'Welcome', 'to': ['devup@example.com'], ...})
+        """
+        return enqueue(self.name, args, kwargs, max_attempts=self.max_attempts)
+
+
+def task(name: Optional[str] = None,
+         max_attempts: Optional[int] = None) -> Callable[[Callable[..., Any]], Task]:
+    """
+    Register a function as a task, by its dotted path unless a name is given.
+    `max_attempts` defaults to `JOB_MAX_ATTEMPTS`.
+    """
+    def register(func: Callable[..., Any]) -> Task:
+        registered = Task(func, name or f'{func.__module__}.{func.__qualname__}', max_attempts)
+        TASKS[registered.name] = registered
+        return registered
+    return register
+
+
+def enqueue(name: str, args: Any = (), kwargs: Optional[Dict[str, Any]] = None,
+            max_attempts: Optional[int] = None, run_at: Optional[datetime] = None) -> Job:
+    return Job.objects.create(
+        task=name,
+        arguments=json.dumps({'args': list(args), 'kwargs': kwargs or {}}),
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_at=run_at or timezone.now(),
+    )
+
+
+def backoff(attempts: int) -> timedelta:
+    """
+    The delay before the next attempt of a job which has failed `attempts` times.
+
+        Example:
+        >>> backoff(3)  # with JOB_RETRY_BACKOFF = 10
+        datetime.timedelta(seconds=40)
+    """
+    seconds = min(settings.JOB_RETRY_BACKOFF * 2 ** (attempts - 1), settings.JOB_RETRY_BACKOFF_MAX)
+    return timedelta(seconds=seconds)
+
+
+def claim(limit: int) -> List[Job]:
+    """
+    Lock up to `limit` due jobs for this worker, skipping the ones other workers are claiming.
+    """
+    now = timezone.now()
+    due = Q(status=Job.Status.QUEUED, run_at__lte=now)
+    due |= Q(status=Job.Status.RUNNING,
+             locked_at__lt=now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT))
+
+    with transaction.atomic():
+        jobs = list(Job.objects.select_for_update(skip_locked=True)
+                    .filter(due)
+                    .order_by('run_at', 'id')[:limit])
+        Job.objects.filter(id__in=[job.id for job in jobs]) \
+            .update(status=Job.Status.RUNNING, locked_at=now, attempts=F('attempts') + 1)
+
+    for job in jobs:
+        job.status, job.locked_at, job.attempts = Job.Status.RUNNING, now, job.attempts + 1
+    return jobs
+
+
+def run_job(job: Job) -> bool:
+    """
+    Run a claimed job, and delete it if it succeeds or schedule its next attempt otherwise.
+    The database changes of the task are rolled back when it raises.
+    """
+    # Only the worker which holds the claim may finish the job.
+    claimed = Job.objects.filter(id=job.id, locked_at=job.locked_at)
+    try:
+        func = TASKS[job.task]
+        arguments = json.loads(job.arguments)
+        with transaction.atomic():
+            func(*arguments['args'], **arguments['kwargs'])
+    except Exception:
+        logger.exception('Job %s of %s failed on attempt %s.', job.id, job.task, job.attempts)
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            claimed.update(status=Job.Status.FAILED, locked_at=None, last_error=error)
+        else:
+            claimed.update(status=Job.Status.QUEUED, locked_at=None, last_error=error,
+                           run_at=timezone.now() + backoff(job.attempts))
+        return False
+
+    claimed.delete()
+    return True
+
+
+def run_pending(limit: int) -> int:
+    """
+    Claim and run up to `limit` due jobs and return the number of jobs which were run.
+    """
+    jobs = claim(limit)
+    for job in jobs:
+        run_job(job)
+    return len(jobs)
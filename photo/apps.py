@@ -1,5 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class PhotoConfig(AppConfig):
     name = 'photo'
+
+    def ready(self) -> None:
+        from PIL import Image
+
+        import photo.signals  # noqa: F401
+
+        # Pillow warns about images above the limit and refuses the ones above twice of it.
+        Image.MAX_IMAGE_PIXELS = settings.PHOTO_MAX_PIXELS
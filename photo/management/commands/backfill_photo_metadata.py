@@ -0,0 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+from typing import Any, Dict, Optional
+
+from PIL import Image
+from django.core.management.base import BaseCommand, CommandParser
+
+from photo.metadata import METADATA_FIELDS, read_metadata
+from photo.models import photo
+
+
+class Command(BaseCommand):
+    help = 'Read the metadata of the photos which were uploaded before it was recorded.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='threads reading images at once')
+        parser.add_argument('--batch-size', type=int, default=100)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        default = photo._meta.get_field('image').default
+        pending = (photo.objects.filter(width__isnull=True)
+                   .exclude(image=default)
+                   .exclude(image='')
+                   .order_by('id')
+                   .only('id', 'image'))
+
+        last_id, filled, failed = 0, 0, 0
+        # Pillow releases the GIL while decoding, so threads read images in parallel.
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            while True:
+                batch = list(pending.filter(id__gt=last_id)[:options['batch_size']])
+                if not batch:
+                    break
+
+                read = []
+                for instance, metadata in zip(batch, executor.map(self._read, batch)):
+                    if metadata is None:
+                        failed += 1
+                        continue
+                    for name, value in metadata.items():
+                        setattr(instance, name, value)
+                    read.append(instance)
+
+                photo.objects.bulk_update(read, METADATA_FIELDS)
+                filled += len(read)
+                last_id = batch[-1].id
+
+        self.stdout.write(f'Filled the metadata of {filled} photos, {failed} failed.')
+
+    def _read(self, instance: photo) -> Optional[Dict[str, Any]]:
+        try:
+            with instance.image.open('rb') as f:
+                return read_metadata(f, instance.image.size)
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            self.stderr.write(f'Photo {instance.id}: {e}')
+            return None
@@ -0,0 +1,60 @@
+"""
+Metadata of photos which lets clients lay out pages before any image is downloaded.
+"""
+import base64
+import io
+from typing import IO, Any, Dict
+
+from PIL import Image, ImageOps
+
+METADATA_FIELDS = ('width', 'height', 'format', 'file_size', 'placeholder')
+
+PLACEHOLDER_SIZE = (16, 16)
+
+# EXIF orientations of images whose pixels are shown rotated by 90 or 270 degrees.
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+EXIF_ORIENTATION = 0x0112
+
+
+def placeholder(image: Image.Image) -> str:
+    """
+    A data URI of the image scaled down to fit in PLACEHOLDER_SIZE, a few hundred bytes
+    which clients blur and stretch while the image is loading.
+    """
+    # JPEG images are decoded at an eighth of their size at most.
+    image.draft('RGB', PLACEHOLDER_SIZE)
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail(PLACEHOLDER_SIZE)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+    buffer = io.BytesIO()
+    image.save(buffer, 'WEBP', quality=40)
+    return 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode()
+
+
+def read_metadata(file: IO[bytes], file_size: int) -> Dict[str, Any]:
+    """
+    The values of the metadata fields of `photo` for an image file.
+    The width and the height are the ones the image is shown at, after its EXIF orientation.
+
+        Example:
+        >>> with open('banner.jpg', 'rb') as f:
+        ...     read_metadata(f, os.path.getsize('banner.jpg'))
+        {'width': 1600, 'height': 1200, 'format': 'JPEG', 'file_size': 204800,
+         'placeholder': 'data:image/webp;base64,UklGR...'}
+    """
+    file.seek(0)
+    with Image.open(file) as image:
+        width, height = image.size
+        if image.getexif().get(EXIF_ORIENTATION) in TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+        metadata = {
+            'width': width,
+            'height': height,
+            'format': image.format or '',
+            'file_size': file_size,
+            'placeholder': placeholder(image),
+        }
+    file.seek(0)
+    return metadata
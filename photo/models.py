@@ -1,4 +1,8 @@
-from django.db import models
+from typing import Any
+
+from django.db import models, transaction
+
+from photo.storage import content_storage
 
 
 # Create your models here.
@@ -6,7 +10,46 @@ class photo(models.Model):
     photo_category = models.CharField(max_length=30)
     photo_detail = models.CharField(max_length=30)
     # set default to anything or blank image
-    image = models.ImageField(upload_to="images/%Y/%m/%d", default='images/None/no-img,jpg')
+    image = models.ImageField(upload_to="images", storage=content_storage,
+                              default='images/None/no-img,jpg')
+    # Resized copies of the image, generated in the background by photo.variants.
+    thumbnail = models.ImageField(upload_to="thumbnails", storage=content_storage, blank=True,
+                                  editable=False)
+    medium = models.ImageField(upload_to="medium", storage=content_storage, blank=True,
+                               editable=False)
+    webp = models.ImageField(upload_to="webp", storage=content_storage, blank=True,
+                             editable=False)
+    # Read from the image when it is uploaded by photo.metadata.
+    width = models.PositiveIntegerField(null=True, editable=False)
+    height = models.PositiveIntegerField(null=True, editable=False)
+    format = models.CharField(max_length=10, blank=True, editable=False)
+    file_size = models.PositiveIntegerField(null=True, editable=False)
+    placeholder = models.TextField(blank=True, editable=False)
+
+    class Meta:
+        # `PhotoViewSet.list` pages through the newest photos, optionally of a category
+        # or a detail, by their IDs.
+        indexes = [
+            models.Index(fields=['photo_category', 'id'], name='photo_category_id_idx'),
+            models.Index(fields=['photo_detail', 'id'], name='photo_detail_id_idx'),
+        ]
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        # The files are stored before the row is written, so the references
+        # which they add to `StoredFile` are rolled back with the row if writing it fails.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     def __str__(self) -> str:
         return f'Photo(category="{self.photo_category}", detail="{self.photo_detail}")'
+
+
+class StoredFile(models.Model):
+    """
+    A file of photo.storage.ContentAddressedStorage and the number of references to it.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    references = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f'StoredFile(name="{self.name}", references={self.references})'
@@ -0,0 +1,37 @@
+from typing import Any, Dict, Iterable, List, cast
+
+from django.db import models
+from django.db.models.query import QuerySet
+from rest_framework.request import Request
+
+from photo.models import photo
+
+# The columns that `ImageSerializer` reads, with the names of `values()`.
+PHOTO_COLUMNS = ('id', 'photo_category', 'photo_detail', 'image', 'thumbnail', 'medium', 'webp',
+                 'width', 'height', 'format', 'file_size', 'placeholder')
+IMAGE_COLUMNS = ('image', 'thumbnail', 'medium', 'webp')
+
+
+def project_photos(photos: 'QuerySet[photo]') -> 'QuerySet[photo]':
+    return photos.values(*PHOTO_COLUMNS)
+
+
+def build_photos(rows: Iterable[Dict[str, Any]], request: Request) -> List[Dict[str, Any]]:
+    """
+    Build the photos like `ImageSerializer` does out of the rows of `project_photos`.
+
+    The URLs of the images are made from their names only, so the storage is never asked
+    whether a file exists or how large it is.
+    """
+    # `build_absolute_uri` of a path is the origin of the request followed by the path.
+    origin = request.build_absolute_uri('/')[:-1]
+    storages = {name: cast(models.FileField, photo._meta.get_field(name)).storage
+                for name in IMAGE_COLUMNS}
+
+    photos = []
+    for row in rows:
+        item = dict(row)
+        for name in IMAGE_COLUMNS:
+            item[name] = origin + storages[name].url(row[name]) if row[name] else None
+        photos.append(item)
+    return photos
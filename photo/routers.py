@@ -15,11 +15,9 @@ Including another URLconf
 """
 
 from django.conf.urls import include
-from django.conf.urls.static import static
 from django.urls import path
 from rest_framework import routers
 
-from dev_up import settings
 from photo import views
 
 router = routers.DefaultRouter()
@@ -29,5 +27,3 @@ router.register(r'', views.PhotoViewSet)
 urlpatterns = [
     path('', include(router.urls)),
 ]
-
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
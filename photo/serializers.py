@@ -1,10 +1,11 @@
 from rest_framework import serializers
 
 from .models import photo
+from .validators import validate_image_pixels, validate_upload_size
 
 
 class ImageSerializer(serializers.ModelSerializer):
-    image = serializers.ImageField()
+    image = serializers.ImageField(validators=[validate_upload_size, validate_image_pixels])
 
     class Meta:
         model = photo
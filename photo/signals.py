@@ -0,0 +1,45 @@
+from typing import Any, Type
+
+from django.db import models
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from photo.models import photo
+
+FILE_FIELDS = [field.name for field in photo._meta.get_fields()
+               if isinstance(field, models.FileField)]
+
+
+def release(instance: photo, field: str, name: str) -> None:
+    """
+    Remove a reference to a stored file, unless it is the default of the field.
+    """
+    if name and name != photo._meta.get_field(field).default:
+        getattr(instance, field).storage.delete(name)
+
+
+@receiver(pre_save, sender=photo)
+def remember_stored_files(sender: Type[photo], instance: photo, **kwargs: Any) -> None:
+    if instance.pk is not None:
+        instance._stored_files = sender.objects.filter(  # type: ignore
+            pk=instance.pk).values(*FILE_FIELDS).first()
+        # Files not committed yet are stored by this save, which adds a reference
+        # even when the content, and so the name, is the same as before.
+        instance._uploaded_fields = {  # type: ignore
+            field for field in FILE_FIELDS if not getattr(instance, field)._committed}
+
+
+@receiver(post_save, sender=photo)
+def release_replaced_files(sender: Type[photo], instance: photo, **kwargs: Any) -> None:
+    previous = getattr(instance, '_stored_files', None) or {}
+    uploaded = getattr(instance, '_uploaded_fields', set())
+    for field, name in previous.items():
+        if name != getattr(instance, field).name or field in uploaded:
+            release(instance, field, name)
+    instance._stored_files = instance._uploaded_fields = None  # type: ignore
+
+
+@receiver(post_delete, sender=photo)
+def release_deleted_files(sender: Type[photo], instance: photo, **kwargs: Any) -> None:
+    for field in FILE_FIELDS:
+        release(instance, field, getattr(instance, field).name)
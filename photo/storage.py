@@ -0,0 +1,107 @@
+"""
+A content-addressed file storage.
+
+Files are named after the SHA-256 of their content, so an image uploaded by many users
+is stored once. Every save of a file adds a reference to it in `StoredFile` and every
+deletion removes one, and the file is removed from the disk with its last reference.
+"""
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+from typing import Optional
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+# Uploads are written here first, on the file system of MEDIA_ROOT so that they can be moved.
+INCOMING_DIR = '.incoming'
+
+CONTENT_NAME_RE = re.compile(r'(^|/)([0-9a-f]{2})/([0-9a-f]{2})/\2\3[0-9a-f]{60}(\.\w+)?$')
+
+
+def content_name(name: str, digest: str) -> str:
+    """
+    The name of a file by its digest, sharded by the first bytes of the digest
+    so that no directory holds too many files.
+
+        Example:
+        >>> content_name('images/Banner.JPG', '3a7bd3e2360a3d29eea436fcfb7e44c7' * 2)
+        'images/3a/7b/3a7bd3e2360a3d29eea436fcfb7e44c73a7bd3e2360a3d29eea436fcfb7e44c7.jpg'
+    """
+    _, extension = posixpath.splitext(name)
+    return posixpath.join(posixpath.dirname(name), digest[:2], digest[2:4],
+                          digest + extension.lower())
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def get_available_name(self, name: str, max_length: Optional[int] = None) -> str:
+        # _save names the file after its content, and files with the same name are the same.
+        return name
+
+    def _save(self, name: str, content: File) -> str:
+        directory = self.path(INCOMING_DIR)
+        os.makedirs(directory, exist_ok=True)
+        fd, incoming = tempfile.mkstemp(dir=directory)
+        try:
+            # The content is hashed while it is written, so it is read only once.
+            digest = hashlib.sha256()
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    f.write(chunk)
+            os.chmod(incoming, self.file_permissions_mode or 0o644)
+
+            name = content_name(name, digest.hexdigest())
+            self._add_reference(name, incoming)
+        finally:
+            if os.path.exists(incoming):
+                os.remove(incoming)
+        return name
+
+    def _add_reference(self, name: str, incoming: str) -> None:
+        from photo.models import StoredFile
+
+        with transaction.atomic():
+            # Locked so that the file can't be collected between the check and the increment.
+            StoredFile.objects.select_for_update().get_or_create(name=name)
+            path = self.path(name)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(incoming, path)
+            StoredFile.objects.filter(name=name).update(references=F('references') + 1)
+
+    def delete(self, name: str) -> None:
+        """
+        Remove a reference to a file and the file itself once the transaction commits,
+        if that was its last reference.
+        Files which were stored under other names before are removed at once.
+        """
+        from photo.models import StoredFile
+
+        if not CONTENT_NAME_RE.search(name):
+            super().delete(name)
+            return
+
+        StoredFile.objects.filter(name=name, references__gt=0) \
+            .update(references=F('references') - 1)
+        transaction.on_commit(lambda: self.collect(name))
+
+    def collect(self, name: str) -> None:
+        """
+        Remove a file which has no references.
+        """
+        from photo.models import StoredFile
+
+        with transaction.atomic():
+            stored = StoredFile.objects.select_for_update().filter(name=name).first()
+            if stored is None or stored.references > 0:
+                return
+            super().delete(name)
+            stored.delete()
+
+
+content_storage = ContentAddressedStorage()
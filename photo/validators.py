@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from rest_framework.exceptions import ValidationError
+
+
+def validate_upload_size(file: UploadedFile) -> None:
+    if file.size > settings.PHOTO_MAX_UPLOAD_SIZE:
+        raise ValidationError(
+            f'The image must not be larger than {settings.PHOTO_MAX_UPLOAD_SIZE} bytes.')
+
+
+def validate_image_pixels(file: UploadedFile) -> None:
+    """
+    Reject images whose decoded pixels would take far more memory than their file,
+    e.g. a small PNG of 50000x50000 pixels which decodes to gigabytes.
+
+    Only the header of the image is read. Images of more than twice `PHOTO_MAX_PIXELS`
+    are already rejected as invalid images by Pillow (see PhotoConfig.ready).
+    """
+    # Set by the image field after it has verified the image.
+    image = getattr(file, 'image', None)
+    if image is None:
+        return
+
+    width, height = image.size
+    if width * height > settings.PHOTO_MAX_PIXELS:
+        raise ValidationError(
+            f'The image must not have more than {settings.PHOTO_MAX_PIXELS} pixels.')
@@ -0,0 +1,144 @@
+"""
+Resized variants of uploaded photos.
+
+Decoding and resizing a photo from a phone takes a good part of a second, so the variants
+are generated on a pool of `PHOTO_VARIANT_WORKERS` threads once the transaction which
+saved the photo commits, and the photo has no variants until they are done.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import io
+import logging
+import os
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from PIL import Image, ImageOps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+
+from photo.models import photo
+from photo.signals import release
+
+logger = logging.getLogger(__name__)
+
+
+class Variant(NamedTuple):
+    size: Tuple[int, int]
+    format: str
+    extension: str
+    quality: int
+
+
+VARIANTS: Dict[str, Variant] = {
+    'thumbnail': Variant(size=(320, 320), format='JPEG', extension='jpg', quality=80),
+    'medium': Variant(size=(1280, 1280), format='JPEG', extension='jpg', quality=85),
+    'webp': Variant(size=(1280, 1280), format='WEBP', extension='webp', quality=80),
+}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.PHOTO_VARIANT_WORKERS,
+                                           thread_name_prefix='photo-variants')
+        return _executor
+
+
+def shutdown() -> None:
+    """
+    Wait for the variants being generated, after which a new pool is started on demand.
+    """
+    global _executor
+    with _executor_lock:
+        pool, _executor = _executor, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def render_variants(image: Image.Image) -> Dict[str, bytes]:
+    """
+    Encode every variant of an image, each fitting in its size with the aspect ratio kept.
+
+        Example:
+        >>> variants = render_variants(Image.new('RGB', (4000, 3000)))
+        >>> Image.open(io.BytesIO(variants['thumbnail'])).size
+        (320, 240)
+    """
+    # JPEG images are decoded at a fraction of their size when that is still large enough,
+    # which is several times faster than decoding every pixel of the original.
+    largest = max(variant.size for variant in VARIANTS.values())
+    image.draft('RGB', largest)
+    # Phone cameras store the orientation in EXIF instead of rotating the pixels.
+    image = ImageOps.exif_transpose(image)
+
+    rendered = {}
+    for name, variant in VARIANTS.items():
+        resized = image.copy()
+        # Never enlarges the image.
+        resized.thumbnail(variant.size, Image.Resampling.LANCZOS)
+        if variant.format == 'JPEG' and resized.mode != 'RGB':
+            resized = resized.convert('RGB')
+        elif resized.mode not in ('RGB', 'RGBA'):
+            resized = resized.convert('RGBA')
+
+        buffer = io.BytesIO()
+        resized.save(buffer, variant.format, quality=variant.quality, optimize=True)
+        rendered[name] = buffer.getvalue()
+    return rendered
+
+
+def generate_variants(photo_id: int) -> None:
+    """
+    Generate and save the variants of a photo.
+
+    The variants are recorded only if the photo still has the image they are made from,
+    so a photo whose image is replaced meanwhile never gets the variants of the old one.
+    The variants which the photo had are released, so generating them again
+    doesn't add references to the same files.
+    """
+    instance = photo.objects.filter(id=photo_id).first()
+    if instance is None or not instance.image:
+        return
+
+    with instance.image.open('rb') as f, Image.open(f) as image:
+        rendered = render_variants(image)
+
+    with transaction.atomic():
+        previous = (photo.objects.select_for_update()
+                    .filter(id=photo_id, image=instance.image.name)
+                    .values(*VARIANTS)
+                    .first())
+        if previous is None:
+            return
+
+        stem, _ = os.path.splitext(os.path.basename(instance.image.name))
+        for name, content in rendered.items():
+            field = getattr(instance, name)
+            field.save(f'{stem}.{VARIANTS[name].extension}', ContentFile(content), save=False)
+
+        photo.objects.filter(id=photo_id).update(
+            **{name: getattr(instance, name).name for name in VARIANTS})
+        for name, stored in previous.items():
+            release(instance, name, stored)
+
+
+def _run(photo_id: int) -> None:
+    close_old_connections()
+    try:
+        generate_variants(photo_id)
+    except Exception:
+        logger.exception('Failed to generate the variants of photo %s.', photo_id)
+    finally:
+        close_old_connections()
+
+
+def generate_variants_later(photo_id: int) -> None:
+    """
+    Generate the variants of a photo in the background once the current transaction commits.
+    """
+    transaction.on_commit(lambda: executor().submit(_run, photo_id))
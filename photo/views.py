@@ -1,12 +1,71 @@
-from rest_framework import viewsets
+from typing import Any
 
+from rest_framework import serializers, viewsets
+from rest_framework.exceptions import ParseError
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from common.pagination import cursor_links, decode_cursor, encode_cursor, paginate_by_cursor
+from photo.metadata import read_metadata
 from photo.models import photo
+from photo.projections import build_photos, project_photos
 from photo.serializers import ImageSerializer
+from photo.variants import VARIANTS, generate_variants_later
 
 # Create your views here.
 
+LIST_FILTERS = ('photo_category', 'photo_detail')
+
 
 class PhotoViewSet(viewsets.ModelViewSet):
 
     queryset = photo.objects.all()
     serializer_class = ImageSerializer
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Get a page of photos, the newest first.
+
+        `photo_category` and `photo_detail` in the query string filter the photos,
+        `pageSize` sets the number of photos in a page (20 by default and 50 at most),
+        and `cursor` selects the page by one of the cursors in `next` and `prev`
+        of the previous page.
+
+        Response: {'next': url, 'prev': url, 'results': [...]}
+        """
+        params = request.query_params
+        photos = photo.objects.all()
+        for name in LIST_FILTERS:
+            if params.get(name):
+                photos = photos.filter(**{name: params[name]})
+
+        try:
+            page_size = min(int(params.get('pageSize', 20)), 50)
+        except ValueError:
+            raise ParseError(detail='Page size should be integer.')
+        if page_size < 1:
+            raise ParseError(detail='Page size should be positive.')
+
+        cursor = decode_cursor(params['cursor']) if params.get('cursor') else None
+        page = paginate_by_cursor(project_photos(photos), ['-id'], cursor, page_size)
+
+        links = cursor_links(request.build_absolute_uri(),
+                             encode_cursor(page.next) if page.next else None,
+                             encode_cursor(page.prev) if page.prev else None)
+        return Response({**links, 'results': build_photos(page.items, request)})
+
+    def perform_create(self, serializer: serializers.BaseSerializer) -> None:
+        image = serializer.validated_data['image']
+        instance = serializer.save(**read_metadata(image, image.size))
+        generate_variants_later(instance.id)
+
+    def perform_update(self, serializer: serializers.BaseSerializer) -> None:
+        if 'image' not in serializer.validated_data:
+            serializer.save()
+            return
+
+        # The variants of the old image are replaced once the new ones are generated.
+        image = serializer.validated_data['image']
+        instance = serializer.save(**read_metadata(image, image.size),
+                                   **{name: '' for name in VARIANTS})
+        generate_variants_later(instance.id)
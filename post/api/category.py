@@ -1,19 +1,33 @@
+from typing import cast
+
+from django.http.response import HttpResponseBase
 from rest_framework import viewsets
 from rest_framework.permissions import AllowAny
 from rest_framework.request import Request
-from rest_framework.response import Response
+from rest_framework.utils.serializer_helpers import ReturnList
 
+from common.cache import cached_response
+from post.cache import CATEGORIES_CACHE_KEY
 from post.models import Category
 from post.serializers import CategorySerializer
 
 
 class CategoryAPI(viewsets.ViewSet):
+    # Served on the thread pool of dev_up.asgi.
+    async_actions = ('list',)
     permission_classes = [AllowAny]
 
-    def list(self, request: Request) -> Response:
+    def _categories(self) -> ReturnList:
+        categories = Category.objects.filter(is_active=True)
+        serializer = CategorySerializer(categories, many=True)
+        # `many=True` makes a ListSerializer, which the stubs don't know about.
+        return cast(ReturnList, serializer.data)
+
+    def list(self, request: Request) -> HttpResponseBase:
         """
         Get the list of categories.
+
+        The list is cached until any of the categories changes, and a request with
+        a matching `If-None-Match` header gets `304 Not Modified` without a body.
         """
-        categories = Category.objects.filter(is_active=True)
-        serializer = CategorySerializer(categories, many=True)
-        return Response(serializer.data)
+        return cached_response(request, CATEGORIES_CACHE_KEY, self._categories)
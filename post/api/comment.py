@@ -1,15 +1,18 @@
 from typing import List, Optional
 
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 from rest_framework import status, viewsets
 from rest_framework.exceptions import ParseError, ValidationError
 from rest_framework.permissions import AllowAny, BasePermission, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from common.permissions import check_permission
-from common.querytools import get_one
-from post.models import Comment
-from post.serializers import CommentCreateSerializer, CommentPutSerializer, CommentSerializer
+from common.permissions import check_updated, filter_permitted
+from post.cache import bump_posts_generation
+from post.models import Comment, Post
+from post.serializers import CommentCreateSerializer, CommentPutSerializer
 
 
 class CommentAPI(viewsets.ViewSet):
@@ -19,6 +22,7 @@ class CommentAPI(viewsets.ViewSet):
         permission_classes = [AllowAny if self.action in ['list', 'retrieve'] else IsAuthenticated]
         return [permission() for permission in permission_classes]
 
+    @transaction.atomic
     def create(self, request: Request) -> Response:
         """
         Create a comment.
@@ -30,11 +34,14 @@ class CommentAPI(viewsets.ViewSet):
 
         serializer = CommentCreateSerializer(data=comment_data)
         if serializer.is_valid():
-            serializer.save()
+            comment = serializer.save()
+            Post.objects.filter(id=comment.post_id).touch(comment_count=F('comment_count') + 1)
+            bump_posts_generation()
             return Response({'detail': 'Successfully created.'}, status=status.HTTP_201_CREATED)
 
         raise ValidationError(detail=serializer.errors)
 
+    @transaction.atomic
     def update(self, request: Request, comment_id: int) -> Response:
         """
         Update data of the comment.
@@ -44,28 +51,33 @@ class CommentAPI(viewsets.ViewSet):
         if request.data.get('content') is None:
             raise ParseError(detail='The content field must be required.')
 
-        comment = get_one(Comment, id=comment_id, is_active=True)
-        check_permission(request.user, comment)
+        serializer = CommentPutSerializer(data={'content': request.data['content']}, partial=True)
+        if not serializer.is_valid():
+            raise ValidationError(detail=serializer.errors)
 
-        comment_data = {'content': request.data['content']}
-        serializer = CommentPutSerializer(comment, data=comment_data, partial=True)
+        comments = Comment.objects.filter(id=comment_id, is_active=True)
+        updated = filter_permitted(comments, request.user).update(**serializer.validated_data)
+        check_updated(updated, comments)
 
-        if serializer.is_valid():
-            serializer.update(comment, validated_data=request.data)
-            return Response({'detail': 'Successfully updated.'})
-
-        raise ValidationError(detail=serializer.errors)
+        Post.objects.filter(comments__id=comment_id).touch()
+        return Response({'detail': 'Successfully updated.'})
 
+    @transaction.atomic
     def destroy(self, request: Request, comment_id: int) -> Response:
         """
         Make the comment disabled.
 
         A specific comment ID must be required by uri resources.
+
+        The comment is disabled with a single `UPDATE` which also checks the author,
+        so a comment is never disabled (and counted off its post) twice.
         """
-        comment = get_one(Comment, id=comment_id, is_active=True)
-        check_permission(request.user, comment)
+        comments = Comment.objects.filter(id=comment_id, is_active=True)
+        updated = filter_permitted(comments, request.user).update(is_active=False)
+        check_updated(updated, comments)
 
-        serializer = CommentSerializer(comment)
-        serializer.update(comment, {'is_active': False})
+        Post.objects.filter(comments__id=comment_id).touch(
+            comment_count=Greatest(F('comment_count') - 1, 0))
+        bump_posts_generation()
 
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,56 @@
+from django.db import transaction
+from django.db.models import Q
+from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from post.cache import bump_posts_generation
+from post.models import Comment, Post, active_comment_count
+from post.serializers import ModerationSerializer
+
+
+class ModerationAPI(viewsets.ViewSet):
+    permission_classes = [IsAdminUser]
+
+    @transaction.atomic
+    def create(self, request: Request) -> Response:
+        """
+        Disable posts and comments in bulk. Only staff users are allowed.
+
+        Request data can have the lists of `posts` and `comments` IDs to disable,
+        and `authors` IDs whose posts and comments are all disabled.
+        The comments of the disabled posts are disabled as well.
+
+        Each kind of object is disabled with a single `UPDATE`, and the comment counts
+        of the other posts which lose comments are recounted at once.
+        A response of `{'posts': count, 'comments': count}` of disabled objects will be returned.
+        """
+        serializer = ModerationSerializer(data=request.data)
+        if not serializer.is_valid():
+            raise ValidationError(detail=serializer.errors)
+
+        post_ids = serializer.validated_data.get('posts', [])
+        comment_ids = serializer.validated_data.get('comments', [])
+        author_ids = serializer.validated_data.get('authors', [])
+
+        moderated_posts = Post.objects.filter(Q(id__in=post_ids) | Q(author_id__in=author_ids))
+
+        moderated_comments = Q(id__in=comment_ids) | Q(author_id__in=author_ids)
+        moderated_comments |= Q(post__in=moderated_posts)
+        comments = Comment.objects.filter(moderated_comments, is_active=True)
+
+        # Posts which stay active but lose comments.
+        recounted_ids = list(comments.exclude(post__in=moderated_posts)
+                             .values_list('post_id', flat=True)
+                             .distinct())
+
+        disabled_posts = moderated_posts.filter(is_active=True).touch(is_active=False)
+        disabled_comments = comments.update(is_active=False)
+        if recounted_ids:
+            Post.objects.filter(id__in=recounted_ids).touch(comment_count=active_comment_count())
+
+        if disabled_posts or disabled_comments:
+            bump_posts_generation()
+        return Response({'posts': disabled_posts, 'comments': disabled_comments})
@@ -1,23 +1,52 @@
-from typing import List, Optional
+from datetime import datetime
+import hashlib
+import json
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
 
+from django.core.cache import cache
 from django.core.paginator import Paginator
 from django.db import transaction
+from django.db.models import Count
 from django.db.models.query import QuerySet
 from django.http.request import QueryDict
+from django.http.response import HttpResponseBase
+from django.utils.http import http_date, quote_etag
 from rest_framework import status, viewsets
-from rest_framework.exceptions import ParseError, ValidationError
+from rest_framework.exceptions import NotFound, ParseError, ValidationError
 from rest_framework.permissions import AllowAny, BasePermission, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from common.permissions import check_permission
-from common.querytools import filter_exists, get_one
-from post.models import Post, Tag
-from post.serializers import (PostCreateSerializer, PostDetailSerializer, PostPatchSerializer,
-                              PostSerializer)
+from common.cache import not_modified
+from common.metrics import record_cache_lookup
+from common.pagination import cursor_links, decode_cursor, encode_cursor, paginate_by_cursor
+from common.permissions import check_updated, filter_permitted
+from common.querytools import bulk_create_with_ids, filter_exists, get_one
+from post.cache import bump_posts_generation, posts_generation
+from post.models import Category, Post, Tag
+from post.projections import build_posts, project_posts
+from post.search import SEARCHED_FIELDS, search_posts, update_search_documents
+from post.serializers import (PostBatchItemSerializer, PostCreateSerializer, PostDetailSerializer,
+                              PostPatchSerializer)
+
+# Query parameters that `PostAPI.list` depends on.
+LIST_PARAMS = ('startDate', 'endDate', 'timeOfDay', 'location', 'category',
+               'tags', 'tagsMode', 'q', 'ordering', 'page', 'pageSize', 'cursor')
+
+# The maximum number of posts created by a batch.
+BATCH_LIMIT = 100
+
+# Values of the `ordering` parameter and the fields to order posts by.
+ORDERINGS = {
+    'id': ['id'],
+    'commentCount': ['comment_count', 'id'],
+    '-commentCount': ['-comment_count', 'id'],
+}
 
 
 class PostAPI(viewsets.ViewSet):
+    # Served on the thread pool of dev_up.asgi.
+    async_actions = ('list', 'retrieve')
     action: Optional[str] = None
 
     def get_permissions(self) -> List[BasePermission]:
@@ -25,54 +54,145 @@ class PostAPI(viewsets.ViewSet):
         return [permission() for permission in permission_classes]
 
     def _tag_filter(self, posts: 'QuerySet[Post]', params: QueryDict) -> 'QuerySet[Post]':
+        """
+        Resolve the tag titles to IDs first and match the posts
+        with a single lookup of the post-tag table.
+
+        `tagsMode=all` (default) keeps the posts that have all of the tags
+        and `tagsMode=any` keeps the posts that have any of them.
+        """
         if len(params.getlist('tags')) > 1:
             raise ParseError(detail='This type of tag parameters are not supported.')
 
-        tags = params['tags'].split(',')
-        for tag in tags:
-            if tag.strip():
-                posts = posts.filter(tags__title__icontains=tag.strip())
+        mode = params.get('tagsMode', 'all')
+        if mode not in ('all', 'any'):
+            raise ParseError(detail='Tags mode should be either all or any.')
+
+        titles = {Tag.normalize(title) for title in params['tags'].split(',')} - {''}
+        if not titles:
+            return posts
 
-        return posts
+        tags = Tag.objects.filter(normalized_title__in=titles)
+        tag_ids = list(tags.values_list('id', flat=True))
+        if mode == 'all' and len(tag_ids) < len(titles):
+            return posts.none()
+
+        post_tags = Post.tags.through.objects.filter(tag_id__in=tag_ids)
+        if mode == 'all':
+            post_tags = (post_tags.values('post_id')
+                         .annotate(matched=Count('tag_id'))
+                         .filter(matched=len(tag_ids)))
+
+        return posts.filter(id__in=post_tags.values('post_id'))
 
     def _convert(self, tag_titles: Optional[List[str]]) -> Optional[List[int]]:
         if tag_titles is not None:
-            tags = [Tag.objects.get_or_create(title=title.strip())[0]
-                    for title in tag_titles if title.strip()]
-            return [tag.id for tag in tags]
+            return Tag.objects.get_or_create_ids(tag_titles)
         return None
 
-    def list(self, request: Request) -> Response:
+    def filter_posts(self, params: QueryDict) -> Tuple['QuerySet[Post]', List[str]]:
         """
-        Get the list of posts.
-
-        If the request has any vaild parameters in the query string,
-        A response that includes a filtered category object by parameters
-        will be returned.
+        Build the queryset of active posts filtered by the query string
+        and the fields to order it by.
         """
-        params = request.GET
-        posts = filter_exists(Post.objects.filter(is_active=True),
+        posts = filter_exists(Post.objects.with_relations().filter(is_active=True),
                               params.dict(),
                               date__gte='startDate',
                               date__lte='endDate',
                               time_of_day='timeOfDay',
                               location__icontains='location',
                               category__title__icontains='category',
-                              ).order_by('id')
+                              )
 
         if 'tags' in params:
             posts = self._tag_filter(posts, params=params)
 
+        ordering = ['id']
+        if params.get('q', '').strip():
+            posts = search_posts(posts, params['q'])
+            ordering = ['-rank', 'id']
+
+        if 'ordering' in params:
+            if params['ordering'] not in ORDERINGS:
+                raise ParseError(detail=f'Ordering should be one of {", ".join(ORDERINGS)}.')
+            ordering = ORDERINGS[params['ordering']]
+
+        return posts, ordering
+
+    def _cache_key(self, params: QueryDict) -> str:
+        normalized = {}
+        for name in LIST_PARAMS:
+            values = [value.strip() for value in params.getlist(name)]
+            if name == 'tags':
+                values = [','.join(sorted({Tag.normalize(title) for title in value.split(',')}))
+                          for value in values]
+            if values:
+                normalized[name] = values
+
+        digest = hashlib.md5(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+        return f'post:list:{posts_generation()}:{digest}'
+
+    def _page(self, params: QueryDict) -> Any:
+        """
+        Build a page of posts out of the selected columns
+        without instantiating models or `PostSerializer`.
+        """
+        posts, ordering = self.filter_posts(params)
+        rows = project_posts(posts, ordering)
+
         try:
             no = int(params.get('page', 1))
             page_size = min(int(params.get('pageSize', 20)), 50)
         except ValueError:
             raise ParseError(detail='Page or page size should be integer.')
+        if page_size < 1:
+            raise ParseError(detail='Page size should be positive.')
+
+        if 'cursor' in params:
+            cursor = decode_cursor(params['cursor']) if params['cursor'] else None
+            page = paginate_by_cursor(rows, ordering, cursor, page_size)
+            return {
+                'next': encode_cursor(page.next) if page.next else None,
+                'prev': encode_cursor(page.prev) if page.prev else None,
+                'results': build_posts(page.items),
+            }
 
-        paginated_posts = Paginator(posts, page_size).get_page(no)
-        serializer = PostSerializer(paginated_posts, many=True)
+        paginated_rows = Paginator(rows.order_by(*ordering), page_size).get_page(no)
+        return build_posts(paginated_rows)
 
-        return Response(serializer.data)
+    def list(self, request: Request) -> Response:
+        """
+        Get the list of posts.
+
+        If the request has any vaild parameters in the query string,
+        A response that includes a filtered category object by parameters
+        will be returned.
+
+        If the query string has a `cursor` parameter (an empty value means the first page),
+        the posts are paginated by the cursor instead of the page number
+        and a response of `{'next': url, 'prev': url, 'results': [...]}` will be returned.
+
+        If the query string has a `q` parameter, only the posts that match the words
+        in their title, content, location or tags are listed in order of relevance.
+
+        `ordering=-commentCount` lists the most discussed posts first.
+
+        Pages are cached by their query parameters until any post is created,
+        updated or deleted.
+        """
+        params = request.GET
+        key = self._cache_key(params)
+        page = cache.get(key)
+        record_cache_lookup('post:list', hit=page is not None)
+        if page is None:
+            page = self._page(params)
+            cache.set(key, page)
+
+        if 'cursor' not in params:
+            return Response(page)
+
+        links = cursor_links(request.build_absolute_uri(), page['next'], page['prev'])
+        return Response({**links, 'results': page['results']})
 
     @transaction.atomic
     def create(self, request: Request) -> Response:
@@ -88,19 +208,116 @@ class PostAPI(viewsets.ViewSet):
         serializer = PostCreateSerializer(data=post_data)
         if serializer.is_valid():
             serializer.save()
+            bump_posts_generation()
             return Response({'detail': 'Successfully created.'}, status=status.HTTP_201_CREATED)
 
         raise ValidationError(detail=serializer.errors)
 
-    def retrieve(self, request: Request, post_id: int = None) -> Response:
+    @transaction.atomic
+    def batch_create(self, request: Request) -> Response:
+        """
+        Create up to `BATCH_LIMIT` posts from a list of posts in request data.
+
+        Every post is validated first, then the tags of all the posts are created at once
+        and the valid posts and their tags are inserted with bulk inserts.
+
+        The response has a result per post in the same order, either `{'id': ...}`
+        or `{'errors': {...}}`, with `201` when every post is created,
+        `207` when some of them are, and `400` when none of them are.
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ParseError(detail='A list of posts must be required.')
+        if len(items) > BATCH_LIMIT:
+            raise ParseError(detail=f'At most {BATCH_LIMIT} posts can be created at once.')
+
+        # Check that the categories exist with a single query.
+        category_ids: Set[int] = set()
+        for item in items:
+            try:
+                category_ids.add(int(item['category']))
+            except (TypeError, KeyError, ValueError):
+                # Reported for the item by PostBatchItemSerializer.
+                continue
+        categories = Category.objects.filter(id__in=category_ids)
+        context = {'category_ids': set(categories.values_list('id', flat=True))}
+
+        results: List[Dict[str, Any]] = []
+        valid: List[Tuple[int, Dict[str, Any]]] = []
+        for index, item in enumerate(items):
+            serializer = PostBatchItemSerializer(data=item, context=context)
+            if serializer.is_valid():
+                valid.append((index, dict(serializer.validated_data)))
+                results.append({})
+            else:
+                results.append({'errors': serializer.errors})
+
+        if not valid:
+            return Response(results, status=status.HTTP_400_BAD_REQUEST)
+
+        titles = [title for _, fields in valid for title in fields.get('tags', [])]
+        tag_ids = dict(zip(dict.fromkeys(Tag.normalize(title) for title in titles),
+                           Tag.objects.get_or_create_ids(titles)))
+
+        posts = bulk_create_with_ids(Post, [
+            Post(author_id=request.user.id,
+                 **{name: value for name, value in fields.items() if name != 'tags'})
+            for _, fields in valid
+        ])
+        Post.tags.through.objects.bulk_create([
+            Post.tags.through(post_id=post.id, tag_id=tag_id)
+            for post, (_, fields) in zip(posts, valid)
+            for tag_id in dict.fromkeys(tag_ids[Tag.normalize(title)]
+                                        for title in fields.get('tags', []))
+        ])
+
+        update_search_documents([post.id for post in posts])
+        bump_posts_generation()
+
+        for post, (index, _) in zip(posts, valid):
+            results[index] = {'id': post.id}
+
+        if len(valid) < len(items):
+            return Response(results, status=status.HTTP_207_MULTI_STATUS)
+        return Response(results, status=status.HTTP_201_CREATED)
+
+    def _etag(self, post_id: int, version: int, modified_date: datetime) -> str:
+        return quote_etag(f'{post_id}-{version}-{modified_date.timestamp():f}')
+
+    def retrieve(self, request: Request, post_id: int = None) -> HttpResponseBase:
         """
         Get a post object.
 
         A specific post ID must be required by uri resources.
+
+        The response has `ETag` and `Last-Modified` headers which change
+        whenever the post or its comments change. A request with matching
+        `If-None-Match` or `If-Modified-Since` headers gets `304 Not Modified`
+        after checking only the version of the post.
         """
-        post = get_one(Post, id=post_id, is_active=True)
+        # A plain mapping, as the stubs type the `version` of the row as optional.
+        state: Optional[Mapping[str, Any]] = (
+            Post.objects.filter(id=post_id, is_active=True)
+            .values('id', 'version', 'modified_date')
+            .first())
+        if state is None:
+            raise NotFound
+
+        etag = self._etag(state['id'], state['version'], state['modified_date'])
+        response = not_modified(request,
+                                etag=etag,
+                                last_modified=int(state['modified_date'].timestamp()))
+        if response is not None:
+            return response
+
+        post = get_one(Post.objects.with_relations(), id=post_id, is_active=True)
         serializer = PostDetailSerializer(post)
-        return Response(serializer.data)
+
+        headers = {
+            'ETag': self._etag(post.id, post.version, post.modified_date),
+            'Last-Modified': http_date(post.modified_date.timestamp()),
+        }
+        return Response(serializer.data, headers=headers)
 
     @transaction.atomic
     def partial_update(self, request: Request, post_id: int) -> Response:
@@ -108,6 +325,9 @@ class PostAPI(viewsets.ViewSet):
         Update data of the post.
 
         A specific post ID must be required by uri resources.
+
+        The post is updated with a single `UPDATE` which also checks the author,
+        looking the post up again only to tell `404` from `403` when nothing is updated.
         """
         patch_data = {**request.data}
 
@@ -120,28 +340,40 @@ class PostAPI(viewsets.ViewSet):
         elif 'author' in patch_data:
             raise ParseError(detail='Author cannot be updated.')
 
-        patch_data['tags'] = self._convert(patch_data.get('tags'))
+        if 'tags' in patch_data:
+            patch_data['tags'] = self._convert(patch_data['tags'])
 
-        post = get_one(Post, id=post_id, is_active=True)
-        check_permission(request.user, post)
+        serializer = PostPatchSerializer(data=patch_data, partial=True)
+        if not serializer.is_valid():
+            raise ValidationError(detail=serializer.errors)
 
-        serializer = PostPatchSerializer(post, data=patch_data, partial=True)
-        if serializer.is_valid():
-            serializer.update(post, validated_data=patch_data)
-            return Response({'detail': 'Successfully updated.'})
+        fields = dict(serializer.validated_data)
+        tag_ids = fields.pop('tags', None)
 
-        raise ValidationError(detail=serializer.errors)
+        posts = Post.objects.filter(id=post_id, is_active=True)
+        updated = filter_permitted(posts, request.user).touch(**fields)
+        check_updated(updated, posts)
+
+        if tag_ids is not None:
+            # Updates the search document through the `m2m_changed` signal.
+            Post(id=post_id).tags.set(tag_ids)
+        elif SEARCHED_FIELDS & fields.keys():
+            update_search_documents([post_id])
+
+        bump_posts_generation()
+        return Response({'detail': 'Successfully updated.'})
 
     def destroy(self, request: Request, post_id: int) -> Response:
         """
         Make the post disabled.
 
         A specific post ID must be required by uri resources.
-        """
-        post = get_one(Post, id=post_id, is_active=True)
-        check_permission(request.user, post)
 
-        serializer = PostSerializer(post)
-        serializer.update(post, {'is_active': False})
+        The post is disabled with a single `UPDATE` which also checks the author.
+        """
+        posts = Post.objects.filter(id=post_id, is_active=True)
+        updated = filter_permitted(posts, request.user).touch(is_active=False)
+        check_updated(updated, posts)
+        bump_posts_generation()
 
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -1,19 +1,32 @@
+from typing import cast
+
+from django.http.response import HttpResponseBase
 from rest_framework import viewsets
 from rest_framework.permissions import AllowAny
 from rest_framework.request import Request
-from rest_framework.response import Response
+from rest_framework.utils.serializer_helpers import ReturnList
 
+from common.cache import cached_response
+from post.cache import TAGS_CACHE_KEY
 from post.models import Tag
 from post.serializers import TagSerializer
 
 
 class TagAPI(viewsets.ViewSet):
+    # Served on the thread pool of dev_up.asgi.
+    async_actions = ('list',)
     permission_classes = [AllowAny]
 
-    def list(self, request: Request) -> Response:
+    def _tags(self) -> ReturnList:
+        tags = Tag.objects.all()
+        serializer = TagSerializer(tags, many=True)
+        return cast(ReturnList, serializer.data)
+
+    def list(self, request: Request) -> HttpResponseBase:
         """
         Get the list of tags.
+
+        The list is cached until any of the tags changes, and a request with
+        a matching `If-None-Match` header gets `304 Not Modified` without a body.
         """
-        tags = Tag.objects.all()
-        serializer = TagSerializer(tags, many=True)
-        return Response(serializer.data)
+        return cached_response(request, TAGS_CACHE_KEY, self._tags)
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class PostConfig(AppConfig):
     name = 'post'
+
+    def ready(self) -> None:
+        import post.signals  # noqa: F401
@@ -0,0 +1,45 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+CATEGORIES_CACHE_KEY = 'post:categories'
+TAGS_CACHE_KEY = 'post:tags'
+POSTS_GENERATION_KEY = 'post:posts:generation'
+
+
+def invalidate(key: str) -> None:
+    """
+    Drop the cached entry now and once again when the current transaction commits,
+    so that a request running in between can't keep the stale data cached.
+    """
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def posts_generation() -> int:
+    """
+    A counter that is part of the keys of cached post lists.
+    Bumping it makes all of them stale at once without scanning keys.
+    """
+    generation = cache.get(POSTS_GENERATION_KEY)
+    if generation is None:
+        # Start from the clock so that a counter lost by the cache
+        # never goes back to a generation that has been used already.
+        cache.add(POSTS_GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(POSTS_GENERATION_KEY)
+    return generation
+
+
+def bump_posts_generation() -> None:
+    """
+    Make the cached post lists stale now and once again when the current transaction commits.
+    """
+    def bump() -> None:
+        try:
+            cache.incr(POSTS_GENERATION_KEY)
+        except ValueError:
+            posts_generation()
+
+    bump()
+    transaction.on_commit(bump)
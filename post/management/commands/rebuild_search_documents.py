@@ -0,0 +1,29 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from post.cache import bump_posts_generation
+from post.models import Post
+from post.search import update_search_documents
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search documents of posts.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        last_id, total = 0, 0
+        while True:
+            post_ids = list(Post.objects.filter(id__gt=last_id)
+                            .order_by('id')
+                            .values_list('id', flat=True)[:options['batch_size']])
+            if not post_ids:
+                break
+
+            update_search_documents(post_ids)
+            last_id, total = post_ids[-1], total + len(post_ids)
+
+        bump_posts_generation()
+        self.stdout.write(f'Rebuilt search documents of {total} posts.')
@@ -0,0 +1,36 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db.models import F
+
+from post.cache import bump_posts_generation
+from post.models import Post, active_comment_count
+
+
+class Command(BaseCommand):
+    help = 'Fix the comment counts of posts that drifted from their active comments.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        active_comments = active_comment_count()
+
+        last_id, fixed = 0, 0
+        while True:
+            post_ids = list(Post.objects.filter(id__gt=last_id)
+                            .order_by('id')
+                            .values_list('id', flat=True)[:options['batch_size']])
+            if not post_ids:
+                break
+
+            drifted = list(Post.objects.filter(id__in=post_ids)
+                           .annotate(actual=active_comments)
+                           .exclude(comment_count=F('actual'))
+                           .values_list('id', flat=True))
+            fixed += Post.objects.filter(id__in=drifted).update(comment_count=active_comments)
+            last_id = post_ids[-1]
+
+        if fixed:
+            bump_posts_generation()
+        self.stdout.write(f'Fixed the comment counts of {fixed} posts.')
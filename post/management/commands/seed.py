@@ -0,0 +1,51 @@
+from typing import Any
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+
+from post.models import Post
+from post.seeding import seed_categories, seed_comments, seed_posts, seed_tags, seed_users
+
+
+class Command(BaseCommand):
+    help = 'Fill the database with users, categories, tags, posts and nested comments.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--tags', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--tags-per-post', type=int, default=3)
+        parser.add_argument('--comments-per-post', type=int, default=3)
+        parser.add_argument('--reply-depth', type=int, default=2,
+                            help='levels of comments including the top level')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    @transaction.atomic
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size = options['batch_size']
+
+        user_ids = seed_users(options['users'], batch_size=batch_size)
+        categories = seed_categories(options['categories'])
+        tag_ids = seed_tags(options['tags'])
+
+        last_post_id = Post.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        seed_posts(options['posts'], batch_size=batch_size, seed=options['seed'],
+                   categories=categories, author_ids=user_ids,
+                   tag_ids=tag_ids, tags_per_post=options['tags_per_post'])
+        post_ids = list(Post.objects.filter(id__gt=last_post_id)
+                        .order_by('id')
+                        .values_list('id', flat=True))
+
+        if options['comments_per_post'] and options['reply_depth']:
+            seed_comments(post_ids, user_ids, options['comments_per_post'],
+                          depth=options['reply_depth'], seed=options['seed'],
+                          batch_size=batch_size)
+
+        # Bulk inserts skip the signals which keep these up to date.
+        call_command('reconcile_comment_counts', stdout=self.stdout)
+        call_command('rebuild_search_documents', stdout=self.stdout)
+
+        self.stdout.write(f'Seeded {len(user_ids)} users and {len(post_ids)} posts.')
@@ -1,5 +1,12 @@
+from typing import Any, Dict, Iterable, List
+
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
+from common.indexes import PortableGinIndex
+from post.cache import TAGS_CACHE_KEY, invalidate
 from user.models import User
 
 # Create your models here.
@@ -24,6 +31,29 @@ class Category(models.Model):
         return f'Category(title="{self.title}")'
 
 
+class PostQuerySet(models.QuerySet):  # type: ignore
+    def with_relations(self) -> 'PostQuerySet':
+        """
+        Load everything that post serializers touch
+        (the author, the category and the tags ordered by ID) in a fixed number of queries.
+        """
+        return (self.select_related('author', 'category')
+                .prefetch_related(models.Prefetch('tags', queryset=Tag.objects.order_by('id')))
+                .defer('search_document', 'search_vector'))
+
+    def touch(self, **fields: Any) -> int:
+        """
+        Bump the version and the modified date of the posts
+        when something shown with them (e.g. their comments) changes,
+        updating the given fields as well.
+        """
+        return self.update(version=models.F('version') + 1, modified_date=timezone.now(),
+                           **fields)
+
+
+PostManager = models.Manager.from_queryset(PostQuerySet)
+
+
 class Post(Modifiable):
     """
     A post model which has simple information.
@@ -38,11 +68,37 @@ class Post(Modifiable):
     time_of_day = models.IntegerField()
     is_active = models.BooleanField(default=True)
     created_date = models.DateTimeField(auto_now_add=True)
+    modified_date = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=1, editable=False)
+    # The number of active comments, maintained by `CommentAPI`.
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
 
     author = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     category = models.ForeignKey('Category', on_delete=models.SET_NULL, null=True)
     tags = models.ManyToManyField('Tag', blank=True)
 
+    # Maintained by `post.search.update_search_documents`.
+    search_document = models.TextField(blank=True, default='', editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = PostManager()
+
+    class Meta:
+        # `PostAPI.list` always filters active posts ordered by ID,
+        # and optionally by a date range and the time of day. The category is matched
+        # by a substring of its title, which an index on `category` can't serve.
+        indexes = [
+            models.Index(fields=['id'], name='post_active_id_idx',
+                         condition=models.Q(is_active=True)),
+            models.Index(fields=['date', 'id'], name='post_active_date_idx',
+                         condition=models.Q(is_active=True)),
+            models.Index(fields=['time_of_day', 'date', 'id'], name='post_active_time_date_idx',
+                         condition=models.Q(is_active=True)),
+            models.Index(fields=['-comment_count', 'id'], name='post_active_comments_idx',
+                         condition=models.Q(is_active=True)),
+            PortableGinIndex(fields=['search_vector'], name='post_search_vector_idx'),
+        ]
+
     def __str__(self) -> str:
         return f'Post(id={self.id}, title="{self.title}")'
 
@@ -64,12 +120,74 @@ class Comment(Modifiable):
         return f'Comment(id={self.id})'
 
 
+def active_comment_count() -> models.Func:
+    """
+    The number of active comments of a post as an expression on posts.
+
+        Example:
+        >>> Post.objects.update(comment_count=active_comment_count())
+    """
+    return Coalesce(models.Subquery(Comment.objects.filter(post=models.OuterRef('pk'),
+                                                           is_active=True)
+                                    .values('post')
+                                    .annotate(count=models.Count('id'))
+                                    .values('count'),
+                                    output_field=models.IntegerField()),
+                    0)
+
+
+class TagManager(models.Manager):  # type: ignore
+    def get_or_create_ids(self, titles: Iterable[str]) -> List[int]:
+        """
+        Resolve tag titles to tag IDs in input order, creating the missing tags.
+
+        Existing tags are selected at once and the missing ones are inserted at once,
+        ignoring conflicts with tags inserted concurrently by other requests.
+        >>> Tag.objects.get_or_create_ids(['React', ' javascript', 'react'])
+        [3, 1]
+        """
+        titles_by_normalized: Dict[str, str] = {}
+        for title in titles:
+            if title.strip():
+                titles_by_normalized.setdefault(self.model.normalize(title), title.strip())
+
+        ids = dict(self.filter(normalized_title__in=titles_by_normalized)
+                   .values_list('normalized_title', 'id'))
+
+        missing = [normalized for normalized in titles_by_normalized if normalized not in ids]
+        if missing:
+            self.bulk_create([self.model(title=titles_by_normalized[normalized],
+                                         normalized_title=normalized)
+                              for normalized in missing],
+                             ignore_conflicts=True)
+            invalidate(TAGS_CACHE_KEY)
+            ids.update(self.filter(normalized_title__in=missing)
+                       .values_list('normalized_title', 'id'))
+
+        return [ids[normalized] for normalized in titles_by_normalized]
+
+
 class Tag(models.Model):
     """
     A Tag model which defines properties of posts.
     ex) Frontend, JavaScript, React, Backend, Node.js, Python, Spring, etc.
     """
     title = models.CharField(max_length=50, unique=True)
+    normalized_title = models.CharField(max_length=50, unique=True, editable=False)
+
+    objects = TagManager()
+
+    @staticmethod
+    def normalize(title: str) -> str:
+        """
+        A tag title for case-insensitive lookups.
+        >>> Tag.normalize(' JavaScript ') == 'javascript'
+        """
+        return title.strip().lower()
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        self.normalized_title = self.normalize(self.title)
+        super().save(*args, **kwargs)
 
     def __str__(self) -> str:
         return f'Tag(title="{self.title}")'
@@ -0,0 +1,91 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Sequence
+
+from django.db.models.query import QuerySet
+from rest_framework import serializers
+
+from post.models import Post
+
+# The columns that `PostSerializer` reads, with the names of `values()`.
+POST_COLUMNS = ('id', 'title', 'content', 'location', 'capacity', 'date', 'time_of_day',
+                'created_date', 'comment_count',
+                'author_id', 'author__email', 'author__name',
+                'category_id', 'category__title', 'category__is_active')
+
+# Fields are only used to format values the same way as `PostSerializer`.
+_date = serializers.DateField()
+_datetime = serializers.DateTimeField()
+
+
+def project_posts(posts: 'QuerySet[Post]', ordering: Sequence[str] = ()) -> 'QuerySet[Post]':
+    """
+    Select only the columns needed to build the posts like `PostSerializer` does,
+    joined with their authors and categories, as dictionaries.
+
+    The fields in `ordering` are selected as well so that the rows can be
+    paginated by a cursor.
+
+        Example:
+        >>> rows = project_posts(Post.objects.filter(is_active=True), ['id'])
+        >>> build_posts(rows[:20])
+    """
+    columns = list(POST_COLUMNS)
+    columns += [name for name in (field.lstrip('-') for field in ordering)
+                if name not in columns]
+    return posts.prefetch_related(None).values(*columns)
+
+
+def _tags_by_post(post_ids: Iterable[int]) -> Dict[int, List[Dict[str, Any]]]:
+    post_tags = (Post.tags.through.objects
+                 .filter(post_id__in=post_ids)
+                 .values_list('post_id', 'tag_id', 'tag__title')
+                 .order_by('tag_id'))
+
+    tags: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    for post_id, tag_id, title in post_tags:
+        tags[post_id].append({'id': tag_id, 'title': title})
+    return tags
+
+
+def build_posts(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Build the same data as `PostSerializer(posts, many=True).data`
+    out of the rows of `project_posts` with plain dictionaries,
+    fetching the tags of all the posts in one query.
+    """
+    rows = list(rows)
+    tags = _tags_by_post([row['id'] for row in rows]) if rows else {}
+
+    posts = []
+    for row in rows:
+        author = None
+        if row['author_id'] is not None:
+            author = {
+                'id': row['author_id'],
+                'email': row['author__email'],
+                'name': row['author__name'],
+            }
+
+        category = None
+        if row['category_id'] is not None:
+            category = {
+                'id': row['category_id'],
+                'title': row['category__title'],
+                'is_active': row['category__is_active'],
+            }
+
+        posts.append({
+            'id': row['id'],
+            'title': row['title'],
+            'content': row['content'],
+            'location': row['location'],
+            'capacity': row['capacity'],
+            'date': _date.to_representation(row['date']),
+            'timeOfDay': row['time_of_day'],
+            'createdDate': _datetime.to_representation(row['created_date']),
+            'commentCount': row['comment_count'],
+            'author': author,
+            'category': category,
+            'tags': tags.get(row['id'], []),
+        })
+    return posts
@@ -18,6 +18,7 @@ from django.urls import path, re_path
 
 from post.api.category import CategoryAPI
 from post.api.comment import CommentAPI
+from post.api.moderation import ModerationAPI
 from post.api.post import PostAPI
 from post.api.tag import TagAPI
 
@@ -31,6 +32,12 @@ urlpatterns = [
     path('/comments', CommentAPI.as_view({
         'post': 'create',
     })),
+    path('/moderation', ModerationAPI.as_view({
+        'post': 'create',
+    })),
+    path('/batch', PostAPI.as_view({
+        'post': 'batch_create',
+    })),
     path('/<int:post_id>', PostAPI.as_view({
         'get': 'retrieve',
         'patch': 'partial_update',
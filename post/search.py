@@ -0,0 +1,78 @@
+from functools import reduce
+import operator
+from typing import Iterable
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Cast
+from django.db.models.query import QuerySet
+
+from post.models import Post
+
+# PostgreSQL text search configuration. `simple` doesn't stem words,
+# which suits Korean and mixed-language posts.
+SEARCH_CONFIG = 'simple'
+
+# The fields of posts which the search documents are built from, besides the tags.
+SEARCHED_FIELDS = {'title', 'location', 'content'}
+
+
+def search_document(post: Post, tag_titles: Iterable[str]) -> str:
+    return ' '.join([post.title, post.location, *tag_titles, post.content])
+
+
+def update_search_vectors(post_ids: Iterable[int]) -> None:
+    """
+    Rebuild the weighted `search_vector` of the posts from their title and search document
+    on PostgreSQL. Other databases search the document itself.
+    """
+    if connection.vendor == 'postgresql':
+        title = SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        document = SearchVector('search_document', weight='B', config=SEARCH_CONFIG)
+        Post.objects.filter(id__in=post_ids).update(search_vector=title + document)
+
+
+def update_search_documents(post_ids: Iterable[int]) -> None:
+    """
+    Rebuild the search documents of the posts from their title, location,
+    tag titles and content.
+
+    On PostgreSQL the weighted `search_vector` is rebuilt as well.
+    """
+    posts = list(Post.objects.filter(id__in=post_ids)
+                 .only('id', 'title', 'location', 'content')
+                 .prefetch_related('tags'))
+    if not posts:
+        return None
+
+    for post in posts:
+        post.search_document = search_document(post, [tag.title for tag in post.tags.all()])
+    Post.objects.bulk_update(posts, ['search_document'])
+    update_search_vectors([post.id for post in posts])
+
+
+def search_posts(posts: 'QuerySet[Post]', text: str) -> 'QuerySet[Post]':
+    """
+    Keep the posts that match every word of the text and annotate them with `rank`.
+
+    PostgreSQL matches the text against the GIN-indexed `search_vector`
+    and ranks by `ts_rank`. Other databases fall back to substring matching
+    on the search document, ranking title matches first.
+    """
+    if connection.vendor == 'postgresql':
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type='plain')
+        return (posts.filter(search_vector=query)
+                # `ts_rank` is a `real`, which the floats of the cursors never equal,
+                # so it is compared as a `double precision` like them.
+                .annotate(rank=Cast(SearchRank(F('search_vector'), query), FloatField())))
+
+    words = text.split()
+    for word in words:
+        posts = posts.filter(search_document__icontains=word)
+
+    scores = [Case(When(title__icontains=word, then=Value(2.0)),
+                   default=Value(1.0),
+                   output_field=FloatField())
+              for word in words]
+    return posts.annotate(rank=reduce(operator.add, scores, Value(0.0, output_field=FloatField())))
@@ -0,0 +1,116 @@
+from datetime import date, timedelta
+import random
+from typing import List, Optional, Sequence, Tuple
+
+from allauth.account.models import EmailAddress
+from django.contrib.auth.hashers import make_password
+
+from common.querytools import last_ids
+from post.models import Category, Comment, Post, Tag
+from user.models import User
+
+LOCATIONS = ['Seoul', 'Busan', 'Incheon', 'Daegu', 'Daejeon', 'Gwangju', 'Pangyo', 'Gangnam']
+
+# Every seeded user can log in with this password.
+SEED_PASSWORD = 'devup-seed-password'
+
+
+def seed_users(count: int, batch_size: int = 10000) -> List[int]:
+    """
+    Insert users with verified email addresses and `SEED_PASSWORD`,
+    which is hashed only once.
+    """
+    password = make_password(SEED_PASSWORD)
+    first = User.objects.count()
+
+    for start in range(0, count, batch_size):
+        emails = [f'user{i}@seed.devup'
+                  for i in range(first + start, first + min(start + batch_size, count))]
+        User.objects.bulk_create([
+            User(email=email, name=email.split('@')[0], password=password, verification=True)
+            for email in emails
+        ])
+        EmailAddress.objects.bulk_create([
+            EmailAddress(user_id=user_id, email=email, verified=True, primary=True)
+            for user_id, email in User.objects.filter(email__in=emails).values_list('id', 'email')
+        ])
+    return last_ids(User, count)
+
+
+def seed_categories(count: int) -> List[Category]:
+    Category.objects.bulk_create([Category(title=f'Category {i}') for i in range(count)],
+                                 ignore_conflicts=True)
+    return list(Category.objects.order_by('id'))
+
+
+def seed_tags(count: int) -> List[int]:
+    Tag.objects.bulk_create([Tag(title=f'Tag{i}', normalized_title=f'tag{i}')
+                             for i in range(count)],
+                            ignore_conflicts=True)
+    return list(Tag.objects.order_by('id').values_list('id', flat=True))
+
+
+def seed_posts(count: int, batch_size: int = 10000, seed: int = 0,
+               categories: Optional[List[Category]] = None,
+               author_ids: Optional[Sequence[int]] = None,
+               tag_ids: Optional[Sequence[int]] = None, tags_per_post: int = 0) -> None:
+    """
+    Insert posts with bulk inserts, spread over two years, every time of day,
+    a few locations and categories. About 10% of the posts are disabled.
+
+    The posts are written by random authors and get random tags when they are given.
+    """
+    rand = random.Random(seed)
+    categories = categories or seed_categories(10)
+    tag_ids = list(tag_ids or [])
+    first_day = date(2020, 1, 1)
+
+    for start in range(0, count, batch_size):
+        size = min(start + batch_size, count) - start
+        Post.objects.bulk_create([
+            Post(title=f'Post {i}',
+                 content=f'Content of post {i}',
+                 location=rand.choice(LOCATIONS),
+                 capacity=rand.randint(2, 20),
+                 date=first_day + timedelta(days=rand.randrange(730)),
+                 time_of_day=rand.randrange(3),
+                 is_active=rand.random() >= 0.1,
+                 author_id=rand.choice(author_ids) if author_ids else None,
+                 category=rand.choice(categories))
+            for i in range(start, start + size)
+        ])
+
+        if tag_ids and tags_per_post:
+            Post.tags.through.objects.bulk_create([
+                Post.tags.through(post_id=post_id, tag_id=tag_id)
+                for post_id in last_ids(Post, size)
+                for tag_id in rand.sample(tag_ids, min(tags_per_post, len(tag_ids)))
+            ])
+
+
+def seed_comments(post_ids: Sequence[int], author_ids: Sequence[int], per_post: int,
+                  depth: int = 1, seed: int = 0, batch_size: int = 10000) -> None:
+    """
+    Insert `per_post` top-level comments on every post and, up to `depth` levels,
+    a reply to every comment of the level above.
+    """
+    rand = random.Random(seed)
+    parents: List[Optional[int]] = [None]
+
+    for level in range(depth):
+        parent_posts: List[Tuple[int, Optional[int]]]
+        parent_posts = ([(post_id, None) for post_id in post_ids for _ in range(per_post)]
+                        if level == 0
+                        else list(Comment.objects.filter(id__in=parents)
+                                  .values_list('post_id', 'id')))
+
+        parents = []
+        for start in range(0, len(parent_posts), batch_size):
+            batch = parent_posts[start:start + batch_size]
+            Comment.objects.bulk_create([
+                Comment(post_id=post_id, parent_comment_id=parent_id,
+                        author_id=rand.choice(author_ids) if author_ids else None,
+                        content=f'Comment on post {post_id} (level {level})')
+                for post_id, parent_id in batch
+            ])
+            parents += last_ids(Comment, len(batch))
@@ -1,4 +1,5 @@
 from post.serializers.category import *  # noqa 401
 from post.serializers.comment import *  # noqa 401
+from post.serializers.moderation import *  # noqa 401
 from post.serializers.post import *  # noqa 401
 from post.serializers.tag import *  # noqa 401
@@ -1,3 +1,5 @@
+from typing import Any, Dict, Iterable, List
+
 from rest_framework import serializers
 
 from post.models import Comment
@@ -20,6 +22,25 @@ class CommentSerializer(serializers.ModelSerializer):
                   'author', 'is_active')
 
 
+def build_comment_tree(comments: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Nest serialized comments under their parent comments as `replies` in a single pass.
+
+    Parents must come before their replies, which holds when the comments are ordered by ID.
+    A reply whose parent is not in the list (e.g. a disabled comment) stays at the top level.
+    """
+    nodes: Dict[int, Dict[str, Any]] = {}
+    tree: List[Dict[str, Any]] = []
+    for comment in comments:
+        node = nodes[comment['id']] = {**comment, 'replies': []}
+        parent = nodes.get(comment['parentComment'])
+        if parent is None:
+            tree.append(node)
+        else:
+            parent['replies'].append(node)
+    return tree
+
+
 class CommentCreateSerializer(serializers.ModelSerializer):
     parentComment = serializers.PrimaryKeyRelatedField(
         queryset=Comment.objects.filter(is_active=True),
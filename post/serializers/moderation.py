@@ -0,0 +1,21 @@
+from typing import Any, Dict
+
+from rest_framework import serializers
+
+# The maximum number of IDs in each list of a moderation.
+MODERATION_LIMIT = 1000
+
+
+class ModerationSerializer(serializers.Serializer):
+    posts = serializers.ListField(child=serializers.IntegerField(), required=False,
+                                  max_length=MODERATION_LIMIT)
+    comments = serializers.ListField(child=serializers.IntegerField(), required=False,
+                                     max_length=MODERATION_LIMIT)
+    authors = serializers.ListField(child=serializers.IntegerField(), required=False,
+                                    max_length=MODERATION_LIMIT)
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        if not any(attrs.get(name) for name in ('posts', 'comments', 'authors')):
+            raise serializers.ValidationError(
+                'At least one of posts, comments or authors must be required.')
+        return attrs
@@ -1,10 +1,11 @@
-from typing import Any, Dict, TypeVar
+from typing import Any, Dict, List, TypeVar
 
 from django.db import models
 from rest_framework import serializers
 
-from post.api.comment import CommentSerializer
 from post.models import Comment, Post
+from post.serializers.comment import CommentSerializer, build_comment_tree
+from post.serializers.tag import TagIdsField, TagSerializer
 from user.serializers import UserDetailsSerializer
 
 T = TypeVar('T', bound=models.Model)
@@ -13,37 +14,44 @@ T = TypeVar('T', bound=models.Model)
 class PostSerializer(serializers.ModelSerializer):
     timeOfDay = serializers.IntegerField(source='time_of_day')
     createdDate = serializers.DateTimeField(source='created_date')
+    commentCount = serializers.IntegerField(source='comment_count', read_only=True)
     author = UserDetailsSerializer(read_only=True)
+    tags = TagSerializer(many=True, read_only=True)
 
     class Meta:
         model = Post
         depth = 1
         fields = ('id', 'title', 'content', 'location',
                   'capacity', 'date', 'timeOfDay', 'createdDate',
-                  'author', 'category', 'tags')
+                  'commentCount', 'author', 'category', 'tags')
 
 
 class PostDetailSerializer(serializers.ModelSerializer):
     timeOfDay = serializers.IntegerField(source='time_of_day')
     createdDate = serializers.DateTimeField(source='created_date')
+    commentCount = serializers.IntegerField(source='comment_count', read_only=True)
     comments = serializers.SerializerMethodField()
     author = UserDetailsSerializer(read_only=True)
+    tags = TagSerializer(many=True, read_only=True)
 
-    def get_comments(self, obj: Post) -> Dict[str, Any]:
-        comments = Comment.objects.filter(post=obj.id, is_active=True)
+    def get_comments(self, obj: Post) -> List[Dict[str, Any]]:
+        comments = (Comment.objects.filter(post=obj.id, is_active=True)
+                    .select_related('author')
+                    .order_by('id'))
         serializer = CommentSerializer(comments, many=True)
-        return serializer.data
+        return build_comment_tree(serializer.data)
 
     class Meta:
         model = Post
         depth = 1
         fields = ('id', 'title', 'content', 'location',
                   'capacity', 'date', 'timeOfDay', 'createdDate',
-                  'author', 'category', 'tags', 'comments')
+                  'commentCount', 'author', 'category', 'tags', 'comments')
 
 
 class PostCreateSerializer(serializers.ModelSerializer):
     timeOfDay = serializers.IntegerField(source='time_of_day')
+    tags = TagIdsField(required=False)
 
     class Meta:
         model = Post
@@ -52,8 +60,31 @@ class PostCreateSerializer(serializers.ModelSerializer):
                   'category', 'tags')
 
 
+class PostBatchItemSerializer(serializers.ModelSerializer):
+    """
+    A post of a batch, which is validated without a query per post.
+
+    The IDs of the existing categories must be given as `category_ids` in the context
+    and the tag titles are resolved to IDs for the whole batch afterwards.
+    """
+    timeOfDay = serializers.IntegerField(source='time_of_day')
+    category = serializers.IntegerField(source='category_id')
+    tags = serializers.ListField(child=serializers.CharField(max_length=50), required=False)
+
+    def validate_category(self, value: int) -> int:
+        if value not in self.context['category_ids']:
+            raise serializers.ValidationError(f'Invalid pk "{value}" - object does not exist.')
+        return value
+
+    class Meta:
+        model = Post
+        fields = ('title', 'content', 'location', 'capacity',
+                  'date', 'timeOfDay', 'category', 'tags')
+
+
 class PostPatchSerializer(serializers.ModelSerializer):
     timeOfDay = serializers.IntegerField(source='time_of_day')
+    tags = TagIdsField(required=False)
 
     def update(self, instance: T, validated_data: Dict[str, Any]) -> Post:
         time_of_day = validated_data.get('timeOfDay')
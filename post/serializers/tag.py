@@ -1,3 +1,5 @@
+from typing import Any, List
+
 from rest_framework import serializers
 
 from post.models import Tag
@@ -7,3 +9,26 @@ class TagSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tag
         fields = ('id', 'title')
+
+
+class TagIdsField(serializers.ListField):
+    """
+    A write-only list of tag IDs which are checked to exist with a single query,
+    instead of one query per tag as `PrimaryKeyRelatedField(many=True)` does.
+    """
+    child = serializers.IntegerField()
+
+    def __init__(self, **kwargs: Any) -> None:
+        kwargs['write_only'] = True
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data: Any) -> List[int]:
+        tag_ids = super().to_internal_value(data)
+        existing = set(Tag.objects.filter(id__in=tag_ids).values_list('id', flat=True))
+        for tag_id in tag_ids:
+            if tag_id not in existing:
+                self.fail_does_not_exist(tag_id)
+        return tag_ids
+
+    def fail_does_not_exist(self, tag_id: int) -> None:
+        raise serializers.ValidationError(f'Invalid pk "{tag_id}" - object does not exist.')
@@ -0,0 +1,56 @@
+from typing import Any, Optional, Set, Type
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from post.cache import CATEGORIES_CACHE_KEY, TAGS_CACHE_KEY, bump_posts_generation, invalidate
+from post.models import Category, Post, Tag
+from post.search import search_document, update_search_documents, update_search_vectors
+
+
+@receiver(pre_save, sender=Post)
+def build_new_post_search_document(sender: Type[Post], instance: Post, **kwargs: Any) -> None:
+    # A new post has no tags yet, so its document is written with the row, and
+    # rebuilt by `update_retagged_search_documents` when its tags are set.
+    if instance.pk is None:
+        instance.search_document = search_document(instance, [])
+
+
+@receiver(post_save, sender=Post)
+def update_post_search_document(sender: Type[Post], instance: Post, created: bool,
+                                **kwargs: Any) -> None:
+    if created:
+        update_search_vectors([instance.id])
+    else:
+        update_search_documents([instance.id])
+
+
+@receiver(post_save, sender=Tag)
+def update_tagged_search_documents(sender: Type[Tag], instance: Tag, created: bool,
+                                   **kwargs: Any) -> None:
+    if not created:
+        update_search_documents(instance.post_set.values_list('id', flat=True))
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_retagged_search_documents(sender: Any, instance: Any, action: str, reverse: bool,
+                                     pk_set: Optional[Set[int]], **kwargs: Any) -> None:
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return None
+
+    if not reverse:
+        update_search_documents([instance.id])
+    elif pk_set:
+        update_search_documents(pk_set)
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_categories(sender: Type[Category], **kwargs: Any) -> None:
+    invalidate(CATEGORIES_CACHE_KEY)
+    bump_posts_generation()
+
+
+@receiver([post_save, post_delete], sender=Tag)
+def invalidate_tags(sender: Type[Tag], **kwargs: Any) -> None:
+    invalidate(TAGS_CACHE_KEY)
+    bump_posts_generation()
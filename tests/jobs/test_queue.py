@@ -0,0 +1,139 @@
+from datetime import timedelta
+import io
+
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+import pytest
+
+from jobs import queue
+from jobs.mail import deserialize_message, serialize_message
+from jobs.models import Job
+from post.models import Category
+
+calls = []
+
+
+@queue.task(max_attempts=3)
+def record(value, suffix=''):
+    calls.append(value + suffix)
+
+
+@queue.task()
+def create_then_fail(title):
+    Category.objects.create(title=title)
+    raise RuntimeError('The mail server is down.')
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+class TestQueue:
+    pytestmark = pytest.mark.django_db
+
+    def test_jobs_run_once(self):
+        record.delay('a', suffix='!')
+        record.delay('b')
+
+        assert calls == []
+        assert queue.run_pending(10) == 2
+        assert calls == ['a!', 'b']
+        assert not Job.objects.exists()
+        assert queue.run_pending(10) == 0
+
+    def test_claimed_jobs_are_skipped(self):
+        record.delay('a')
+        record.delay('b')
+
+        claimed = queue.claim(1)
+        assert [job.attempts for job in claimed] == [1]
+        assert len(queue.claim(10)) == 1
+        assert queue.claim(10) == []
+
+    def test_failures_are_retried_with_backoff(self, settings):
+        settings.JOB_RETRY_BACKOFF = 10
+        job = create_then_fail.delay('Meet-up')
+
+        assert queue.run_pending(10) == 1
+        job.refresh_from_db()
+        assert job.status == Job.Status.QUEUED
+        assert job.attempts == 1
+        assert 'The mail server is down.' in job.last_error
+        assert job.run_at > timezone.now() + timedelta(seconds=9)
+        # The changes of the failed attempt are rolled back.
+        assert not Category.objects.filter(title='Meet-up').exists()
+
+        # Not due yet.
+        assert queue.run_pending(10) == 0
+
+    def test_jobs_fail_after_their_last_attempt(self):
+        job = create_then_fail.delay('Meet-up')
+        for _ in range(job.max_attempts):
+            Job.objects.filter(id=job.id).update(run_at=timezone.now())
+            queue.run_pending(10)
+
+        job.refresh_from_db()
+        assert job.status == Job.Status.FAILED
+        assert job.attempts == job.max_attempts
+        assert queue.run_pending(10) == 0
+
+    def test_jobs_of_dead_workers_are_claimed_again(self, settings):
+        settings.JOB_LOCK_TIMEOUT = 60
+        record.delay('a')
+        job, = queue.claim(10)
+
+        assert queue.claim(10) == []
+        Job.objects.filter(id=job.id).update(locked_at=timezone.now() - timedelta(minutes=2))
+        job, = queue.claim(10)
+        assert job.attempts == 2
+
+    def test_backoff(self, settings):
+        settings.JOB_RETRY_BACKOFF = 10
+        settings.JOB_RETRY_BACKOFF_MAX = 60
+        assert [queue.backoff(attempts).total_seconds() for attempts in range(1, 6)] == \
+            [10, 20, 40, 60, 60]
+
+    def test_command(self):
+        record.delay('a')
+        out = io.StringIO()
+        call_command('run_jobs', once=True, stdout=out)
+
+        assert calls == ['a']
+        assert 'Ran 1 jobs.' in out.getvalue()
+
+
+class TestQueuedEmail:
+    pytestmark = pytest.mark.django_db
+
+    @pytest.fixture(autouse=True)
+    def queued_email(self, settings):
+        settings.EMAIL_BACKEND = 'jobs.mail.QueuedEmailBackend'
+        settings.JOB_EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+    def test_registration_email_is_queued(self, client):
+        response = client.post('/user/auth/registration/', secure=True, data={
+            'username': 'devup', 'email': 'devup@example.com',
+            'password1': 'a-long-password-1', 'password2': 'a-long-password-1'})
+        assert response.status_code == 201
+        assert mail.outbox == []
+        assert Job.objects.filter(task='jobs.mail.send_email').count() == 1
+
+        call_command('run_jobs', once=True, stdout=io.StringIO())
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == ['devup@example.com']
+
+    def test_messages_keep_their_fields(self):
+        message = mail.EmailMultiAlternatives(
+            subject='Welcome', body='Hello', from_email='devup@example.com',
+            to=['a@example.com'], cc=['b@example.com'], bcc=['c@example.com'],
+            reply_to=['d@example.com'], headers={'X-Tag': 'welcome'})
+        message.attach_alternative('<p>Hello</p>', 'text/html')
+        message.attach('notes.txt', 'notes', 'text/plain')
+        message.attach('logo.png', b'\x89PNG', 'image/png')
+
+        copy = deserialize_message(serialize_message(message))
+        for name in ('subject', 'body', 'from_email', 'to', 'cc', 'bcc', 'reply_to',
+                     'extra_headers', 'alternatives', 'attachments'):
+            assert getattr(copy, name) == getattr(message, name)
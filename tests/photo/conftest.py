@@ -0,0 +1,33 @@
+import io
+
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from model_bakery import baker
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from user.models import User
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def token():
+    refresh = RefreshToken.for_user(baker.make(User))
+    return f'Bearer {str(refresh.access_token)}'
+
+
+def make_upload(size=(1600, 1200), format='JPEG', mode='RGB', name='photo.jpg'):
+    buffer = io.BytesIO()
+    Image.new(mode, size, color='red').save(buffer, format)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=f'image/{format.lower()}')
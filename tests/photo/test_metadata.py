@@ -0,0 +1,87 @@
+import base64
+import io
+
+from PIL import Image
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+import pytest
+
+from photo import variants
+from photo.models import photo
+from tests.photo.conftest import make_upload
+
+
+def exif_rotated_jpeg(size):
+    exif = Image.Exif()
+    # Rotated by 90 degrees clockwise when shown.
+    exif[0x0112] = 6
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color='blue').save(buffer, 'JPEG', exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+class TestMetadata:
+    pytestmark = pytest.mark.django_db
+
+    @pytest.fixture(autouse=True)
+    def wait_for_variants(self):
+        yield
+        variants.shutdown()
+
+    def test_metadata_is_read_at_upload(self, api_client, token):
+        upload = make_upload(size=(1600, 1200))
+        response = api_client.post('/photos', secure=True, HTTP_AUTHORIZATION=token, data={
+            'photo_category': 'event', 'photo_detail': 'banner', 'image': upload})
+        assert response.status_code == 201
+
+        data = response.data
+        assert (data['width'], data['height'], data['format']) == (1600, 1200, 'JPEG')
+        assert data['file_size'] == upload.size
+        assert data['placeholder'].startswith('data:image/webp;base64,')
+        preview = base64.b64decode(data['placeholder'].split(',', 1)[1])
+        assert len(preview) < 500
+        assert Image.open(io.BytesIO(preview)).size == (16, 12)
+
+        response = api_client.get('/photos', secure=True, HTTP_AUTHORIZATION=token)
+        assert response.data['results'][0]['placeholder'] == data['placeholder']
+
+    def test_metadata_is_replaced_with_the_image(self, api_client, token):
+        response = api_client.post('/photos', secure=True, HTTP_AUTHORIZATION=token, data={
+            'photo_category': 'event', 'photo_detail': 'banner', 'image': make_upload()})
+
+        response = api_client.patch(f"/photos{response.data['id']}/", secure=True,
+                                    HTTP_AUTHORIZATION=token,
+                                    data={'image': make_upload(size=(64, 32), format='PNG',
+                                                               name='small.png')})
+        assert (response.data['width'], response.data['height']) == (64, 32)
+        assert response.data['format'] == 'PNG'
+
+    def test_orientation(self, api_client, token):
+        upload = ContentFile(exif_rotated_jpeg((400, 300)), name='rotated.jpg')
+        response = api_client.post('/photos', secure=True, HTTP_AUTHORIZATION=token, data={
+            'photo_category': 'event', 'photo_detail': 'banner', 'image': upload})
+
+        assert (response.data['width'], response.data['height']) == (300, 400)
+
+    def test_backfill(self, media_root):
+        photos = []
+        for i in range(5):
+            instance = photo(photo_category='event', photo_detail=str(i))
+            instance.image.save(f'{i}.png', make_upload(size=(100 + i, 50), format='PNG'))
+            photos.append(instance)
+        missing = photo.objects.create(photo_category='event', photo_detail='missing',
+                                       image='images/missing.png')
+        untouched = photo.objects.create(photo_category='event', photo_detail='default')
+
+        out, err = io.StringIO(), io.StringIO()
+        call_command('backfill_photo_metadata', workers=2, batch_size=2, stdout=out, stderr=err)
+
+        assert 'Filled the metadata of 5 photos, 1 failed.' in out.getvalue()
+        assert f'Photo {missing.id}' in err.getvalue()
+        for i, instance in enumerate(photos):
+            instance.refresh_from_db()
+            assert (instance.width, instance.height, instance.format) == (100 + i, 50, 'PNG')
+            assert instance.file_size == instance.image.size
+            assert instance.placeholder
+        untouched.refresh_from_db()
+        assert untouched.width is None
@@ -0,0 +1,87 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from common.pagination import Cursor, encode_cursor
+from photo.models import photo
+from photo.serializers import ImageSerializer
+from photo.storage import ContentAddressedStorage
+
+
+@pytest.fixture
+def photos():
+    return [baker.make(photo, photo_category=category, photo_detail=detail,
+                       image=f'images/{category}-{detail}-{i}.png',
+                       thumbnail=f'thumbnails/{category}-{detail}-{i}.jpg' if i else '')
+            for category in ('event', 'study') for detail in ('banner', 'room') for i in range(3)]
+
+
+class TestPhotoList:
+    pytestmark = pytest.mark.django_db
+
+    def get(self, api_client, token, path='/photos', **params):
+        return api_client.get(path, params, HTTP_AUTHORIZATION=token, secure=True)
+
+    def test_pages(self, api_client, token, photos):
+        response = self.get(api_client, token, pageSize=5)
+        assert response.status_code == 200
+        assert response.data['prev'] is None
+
+        ids = [item['id'] for item in response.data['results']]
+        while response.data['next']:
+            response = self.get(api_client, token, response.data['next'])
+            ids += [item['id'] for item in response.data['results']]
+
+        assert ids == sorted((item.id for item in photos), reverse=True)
+
+        response = self.get(api_client, token, response.data['prev'])
+        assert [item['id'] for item in response.data['results']] == ids[5:10]
+
+    def test_filters(self, api_client, token, photos):
+        response = self.get(api_client, token, photo_category='event')
+        assert {item['photo_category'] for item in response.data['results']} == {'event'}
+        assert len(response.data['results']) == 6
+
+        response = self.get(api_client, token, photo_category='event', photo_detail='room')
+        assert [item['id'] for item in response.data['results']] == \
+            [item.id for item in reversed(photos[3:6])]
+
+    def test_items_are_serialized_like_image_serializer(self, api_client, token, photos):
+        response = self.get(api_client, token)
+
+        request = APIRequestFactory().get('/photos', secure=True)
+        expected = ImageSerializer(sorted(photos, key=lambda item: -item.id), many=True,
+                                   context={'request': request}).data
+        assert response.data['results'] == [dict(item) for item in expected]
+
+    def test_storage_is_not_touched(self, api_client, token, photos, monkeypatch):
+        def fail(*args):
+            raise AssertionError('The storage is read.')
+
+        for name in ('exists', 'size', 'open'):
+            monkeypatch.setattr(ContentAddressedStorage, name, fail)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(api_client, token)
+        assert response.status_code == 200
+        # The user of the token and the page.
+        assert len(queries) == 2
+
+    def test_invalid_params(self, api_client, token):
+        assert self.get(api_client, token, pageSize='many').status_code == 400
+        assert self.get(api_client, token, pageSize=0).status_code == 400
+        assert self.get(api_client, token, cursor='invalid').status_code == 400
+        for position in (['abc'], [None], [[1]]):
+            cursor = encode_cursor(Cursor(position))
+            assert self.get(api_client, token, cursor=cursor).status_code == 400
+
+    @pytest.mark.parametrize('params, index', [
+        ({'photo_category': 'event'}, 'photo_category_id_idx'),
+        ({'photo_detail': 'room'}, 'photo_detail_id_idx'),
+    ])
+    def test_filters_use_indexes(self, photos, params, index):
+        plan = photo.objects.filter(**params).order_by('-id')[:21].explain()
+        assert index in plan
+        assert 'TEMP B-TREE' not in plan
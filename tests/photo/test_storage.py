@@ -0,0 +1,148 @@
+import hashlib
+import os
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models.signals import post_save
+import pytest
+
+from photo import variants
+from photo.models import StoredFile, photo
+from photo.storage import content_storage
+from tests.photo.conftest import make_upload
+
+
+def references(name):
+    return StoredFile.objects.get(name=name).references
+
+
+class TestContentAddressedStorage:
+    pytestmark = pytest.mark.django_db(transaction=True)
+
+    @pytest.fixture(autouse=True)
+    def wait_for_variants(self):
+        yield
+        variants.shutdown()
+
+    def test_files_are_named_by_content(self, media_root):
+        name = content_storage.save('images/Banner.PNG', ContentFile(b'banner'))
+
+        digest = hashlib.sha256(b'banner').hexdigest()
+        assert name == f'images/{digest[:2]}/{digest[2:4]}/{digest}.png'
+        assert (media_root / name).read_bytes() == b'banner'
+        assert references(name) == 1
+        assert not os.listdir(media_root / '.incoming')
+
+    def test_identical_files_are_stored_once(self, media_root):
+        first = content_storage.save('images/a.png', ContentFile(b'banner'))
+        second = content_storage.save('images/b.png', ContentFile(b'banner'))
+        other = content_storage.save('images/c.png', ContentFile(b'other'))
+
+        assert first == second != other
+        assert references(first) == 2
+
+        content_storage.delete(first)
+        assert content_storage.exists(first)
+        assert references(first) == 1
+
+        content_storage.delete(second)
+        assert not content_storage.exists(first)
+        assert not StoredFile.objects.filter(name=first).exists()
+        assert content_storage.exists(other)
+
+    def test_deleted_file_is_stored_again(self, media_root):
+        name = content_storage.save('images/a.png', ContentFile(b'banner'))
+        content_storage.delete(name)
+
+        assert content_storage.save('images/b.png', ContentFile(b'banner')) == name
+        assert content_storage.exists(name)
+        assert references(name) == 1
+
+    def test_files_stay_until_the_transaction_commits(self, media_root):
+        name = content_storage.save('images/a.png', ContentFile(b'banner'))
+
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                content_storage.delete(name)
+                raise RuntimeError
+        assert content_storage.exists(name)
+        assert references(name) == 1
+
+    def test_photos_share_uploads(self, api_client, token, media_root):
+        ids = []
+        for _ in range(2):
+            data = {'photo_category': 'event', 'photo_detail': 'banner',
+                    'image': make_upload()}
+            response = api_client.post('/photos', data=data, HTTP_AUTHORIZATION=token,
+                                       secure=True)
+            ids.append(response.data['id'])
+        variants.shutdown()
+
+        first, second = photo.objects.filter(id__in=ids)
+        assert first.image.name == second.image.name
+        assert first.thumbnail.name == second.thumbnail.name
+        assert references(first.image.name) == 2
+        assert references(first.thumbnail.name) == 2
+
+        api_client.delete(f'/photos{first.id}/', HTTP_AUTHORIZATION=token, secure=True)
+        assert second.image.storage.exists(second.image.name)
+        assert references(second.image.name) == 1
+
+        # Replacing the image releases the old one and its variants.
+        api_client.patch(f'/photos{second.id}/', data={'image': make_upload(size=(300, 200))},
+                         HTTP_AUTHORIZATION=token, secure=True)
+        variants.shutdown()
+        assert not second.image.storage.exists(second.image.name)
+        assert not second.thumbnail.storage.exists(second.thumbnail.name)
+        assert StoredFile.objects.filter(references=0).count() == 0
+
+    def test_photo_updated_with_the_same_content(self, api_client, token, media_root):
+        data = {'photo_category': 'event', 'photo_detail': 'banner', 'image': make_upload()}
+        response = api_client.post('/photos', data=data, HTTP_AUTHORIZATION=token, secure=True)
+        photo_id = response.data['id']
+        variants.shutdown()
+        name = photo.objects.get(id=photo_id).image.name
+
+        data['image'] = make_upload()
+        response = api_client.put(f'/photos{photo_id}/', data=data, HTTP_AUTHORIZATION=token,
+                                  secure=True)
+        assert response.status_code == 200
+        variants.shutdown()
+        assert photo.objects.get(id=photo_id).image.name == name
+        assert references(name) == 1
+
+        api_client.delete(f'/photos{photo_id}/', HTTP_AUTHORIZATION=token, secure=True)
+        assert not content_storage.exists(name)
+        assert not StoredFile.objects.exists()
+
+    def test_references_are_rolled_back_with_the_photo(self, media_root):
+        def fail(**kwargs):
+            raise RuntimeError
+
+        post_save.connect(fail, sender=photo)
+        try:
+            with pytest.raises(RuntimeError):
+                photo.objects.create(photo_category='event', photo_detail='banner',
+                                     image=make_upload())
+        finally:
+            post_save.disconnect(fail, sender=photo)
+        assert not photo.objects.exists()
+        assert not StoredFile.objects.exists()
+
+    def test_generating_variants_again(self, api_client, token, media_root):
+        data = {'photo_category': 'event', 'photo_detail': 'banner', 'image': make_upload()}
+        response = api_client.post('/photos', data=data, HTTP_AUTHORIZATION=token, secure=True)
+        variants.shutdown()
+
+        variants.generate_variants(response.data['id'])
+        instance = photo.objects.get(id=response.data['id'])
+        for name in variants.VARIANTS:
+            assert references(getattr(instance, name).name) == 1
+
+    def test_default_image_is_kept(self, media_root):
+        default = photo._meta.get_field('image').default
+        (media_root / default).parent.mkdir(parents=True)
+        (media_root / default).write_bytes(b'placeholder')
+
+        photo.objects.create(photo_category='event', photo_detail='banner').delete()
+        assert (media_root / default).exists()
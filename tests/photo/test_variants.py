@@ -0,0 +1,99 @@
+import io
+
+from PIL import Image
+import pytest
+
+from photo import variants
+from photo.models import photo
+from tests.photo.conftest import make_upload
+
+
+def image_size(field):
+    with field.open('rb') as f:
+        return Image.open(io.BytesIO(f.read())).size
+
+
+class TestVariants:
+    pytestmark = pytest.mark.django_db(transaction=True)
+
+    @pytest.fixture(autouse=True)
+    def wait_for_variants(self):
+        yield
+        variants.shutdown()
+
+    def upload(self, api_client, token, **kwargs):
+        data = {'photo_category': 'event', 'photo_detail': 'banner',
+                'image': make_upload(**kwargs)}
+        return api_client.post('/photos', data=data, HTTP_AUTHORIZATION=token, secure=True)
+
+    def test_variants_are_generated_after_upload(self, api_client, token):
+        response = self.upload(api_client, token)
+        assert response.status_code == 201
+        assert response.data['thumbnail'] is None
+
+        variants.shutdown()
+
+        instance = photo.objects.get(id=response.data['id'])
+        assert image_size(instance.thumbnail) == (320, 240)
+        assert image_size(instance.medium) == (1280, 960)
+        assert instance.webp.name.endswith('.webp')
+
+        response = api_client.get(f'/photos{instance.id}/', HTTP_AUTHORIZATION=token,
+                                  secure=True)
+        for name in variants.VARIANTS:
+            assert response.data[name].endswith(getattr(instance, name).url)
+
+    def test_small_images_are_not_enlarged(self, api_client, token):
+        response = self.upload(api_client, token, size=(200, 100), format='PNG', mode='RGBA',
+                               name='photo.png')
+        variants.shutdown()
+
+        instance = photo.objects.get(id=response.data['id'])
+        assert image_size(instance.thumbnail) == (200, 100)
+        assert image_size(instance.webp) == (200, 100)
+
+    def test_replaced_image_gets_new_variants(self, api_client, token):
+        response = self.upload(api_client, token)
+        variants.shutdown()
+
+        photo_id = response.data['id']
+        response = api_client.patch(f'/photos{photo_id}/', HTTP_AUTHORIZATION=token,
+                                    data={'image': make_upload(size=(600, 300))}, secure=True)
+        assert response.status_code == 200
+        assert response.data['medium'] is None
+
+        variants.shutdown()
+        assert image_size(photo.objects.get(id=photo_id).medium) == (600, 300)
+
+    def test_variants_of_a_replaced_image_are_dropped(self, api_client, token,
+                                                      monkeypatch, media_root):
+        response = self.upload(api_client, token)
+        variants.shutdown()
+        photo_id = response.data['id']
+        photo.objects.filter(id=photo_id).update(thumbnail='', medium='', webp='')
+        render_variants = variants.render_variants
+
+        def replace_while_rendering(image):
+            photo.objects.filter(id=photo_id).update(image='images/other.jpg')
+            return render_variants(image)
+
+        monkeypatch.setattr(variants, 'render_variants', replace_while_rendering)
+        variants.generate_variants(photo_id)
+
+        instance = photo.objects.get(id=photo_id)
+        assert not instance.thumbnail
+        # Only the files of the first generation remain.
+        assert len(list((media_root / 'thumbnails').glob('*/*/*'))) == 1
+
+    def test_uploads_are_limited(self, api_client, token, settings):
+        settings.PHOTO_MAX_UPLOAD_SIZE = 1000
+        response = self.upload(api_client, token)
+        assert response.status_code == 400
+        assert 'image' in response.data
+
+    def test_decompression_bombs_are_rejected(self, api_client, token, settings):
+        settings.PHOTO_MAX_PIXELS = 1000 * 1000
+        response = self.upload(api_client, token, size=(1200, 1000), format='PNG',
+                               name='bomb.png')
+        assert response.status_code == 400
+        assert photo.objects.count() == 0
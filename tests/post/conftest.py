@@ -1,5 +1,6 @@
 from typing import List
 
+from django.core.cache import cache
 from model_bakery import baker
 import pytest
 from rest_framework.test import APIClient
@@ -9,6 +10,11 @@ from post.models import Category, Comment, Post, Tag
 from user.models import User
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
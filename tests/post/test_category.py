@@ -1,5 +1,8 @@
+from model_bakery import baker
 import pytest
 
+from post.models import Category
+
 
 class TestCategory:
     pytestmark = pytest.mark.django_db
@@ -8,3 +11,19 @@ class TestCategory:
         response = api_client.get('/posts/categories', secure=True)
         assert response.status_code == 200
         assert len(response.data) > 1
+
+    def test_list_categories_with_etag(self, api_client, categories):
+        response = api_client.get('/posts/categories', secure=True)
+        etag = response['ETag']
+
+        response = api_client.get('/posts/categories', HTTP_IF_NONE_MATCH=etag, secure=True)
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+        assert not response.content
+
+        # A change of the categories invalidates the cached list.
+        baker.make(Category)
+        response = api_client.get('/posts/categories', HTTP_IF_NONE_MATCH=etag, secure=True)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+        assert len(response.data) == len(categories) + 1
@@ -1,6 +1,8 @@
+from django.core.management import call_command
+from model_bakery import baker
 import pytest
 
-from post.models import Comment
+from post.models import Comment, Post
 
 
 class TestComment:
@@ -48,3 +50,69 @@ class TestComment:
 
         assert response.status_code == 204
         assert not comment.is_active
+
+    def test_change_comment_of_another_user(self, api_client, users, posts, token):
+        comment = baker.make(Comment, post=posts[0], author=users[1], content='before')
+
+        response = api_client.put(f'/posts/comments/{comment.id}', data={'content': 'after'},
+                                  HTTP_AUTHORIZATION=token, format='json', secure=True)
+        assert response.status_code == 403
+        response = api_client.delete(f'/posts/comments/{comment.id}',
+                                     HTTP_AUTHORIZATION=token, secure=True)
+        assert response.status_code == 403
+
+        comment.refresh_from_db()
+        assert comment.content == 'before'
+        assert comment.is_active
+
+        response = api_client.delete('/posts/comments/65535', HTTP_AUTHORIZATION=token,
+                                     secure=True)
+        assert response.status_code == 404
+
+    def test_comment_tree_on_post_detail(self, api_client, posts, users):
+        post = posts[0]
+        root = baker.make(Comment, post=post, author=users[0])
+        reply1, reply2 = baker.make(Comment, post=post, author=users[1], parent_comment=root,
+                                    _quantity=2)
+        disabled = baker.make(Comment, post=post, parent_comment=root, is_active=False)
+        other_root = baker.make(Comment, post=post, author=users[2])
+
+        response = api_client.get(f'/posts/{post.id}', secure=True)
+        assert response.status_code == 200
+
+        comments = response.data['comments']
+        assert [comment['id'] for comment in comments] == [root.id, other_root.id]
+        assert [reply['id'] for reply in comments[0]['replies']] == [reply1.id, reply2.id]
+        assert comments[0]['replies'][0]['author']['id'] == users[1].id
+        assert comments[0]['replies'][0]['replies'] == []
+        assert comments[1]['replies'] == []
+        assert disabled.id not in [reply['id'] for reply in comments[0]['replies']]
+
+    def test_comment_count(self, api_client, users, posts, token):
+        post = posts[0]
+        for content in ['first', 'second']:
+            data = {'content': content, 'post': post.id}
+            response = api_client.post('/posts/comments', data=data,
+                                       HTTP_AUTHORIZATION=token, format='json', secure=True)
+            assert response.status_code == 201
+
+        response = api_client.get(f'/posts/{post.id}', secure=True)
+        assert response.data['commentCount'] == 2
+
+        comment = Comment.objects.filter(post=post).first()
+        response = api_client.delete(f'/posts/comments/{comment.id}',
+                                     HTTP_AUTHORIZATION=token, secure=True)
+        assert response.status_code == 204
+
+        response = api_client.get('/posts', secure=True)
+        assert [result['commentCount'] for result in response.data] == [1, 0, 0]
+
+    def test_reconcile_comment_counts(self, posts):
+        baker.make(Comment, post=posts[0], _quantity=3)
+        baker.make(Comment, post=posts[0], is_active=False)
+        Post.objects.filter(id=posts[1].id).update(comment_count=5)
+
+        call_command('reconcile_comment_counts', batch_size=2)
+
+        counts = dict(Post.objects.values_list('id', 'comment_count'))
+        assert counts == {posts[0].id: 3, posts[1].id: 0, posts[2].id: 0}
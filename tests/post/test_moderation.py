@@ -0,0 +1,75 @@
+from model_bakery import baker
+import pytest
+
+from post.models import Comment, Post
+
+
+@pytest.fixture
+def staff_token(users, token):
+    users[0].is_staff = True
+    users[0].save()
+    return token
+
+
+@pytest.fixture
+def spam(users):
+    spammer, other = users[1], users[2]
+    spam_posts = baker.make(Post, author=spammer, _quantity=3)
+    post = baker.make(Post, author=other)
+    baker.make(Comment, post=spam_posts[0], author=other, _quantity=2)
+    baker.make(Comment, post=post, author=spammer, _quantity=2)
+    baker.make(Comment, post=post, author=other)
+    Post.objects.filter(id=post.id).update(comment_count=3)
+    return spammer, spam_posts, post
+
+
+class TestModeration:
+    pytestmark = pytest.mark.django_db
+
+    def test_moderate_author(self, api_client, spam, staff_token):
+        spammer, spam_posts, post = spam
+
+        response = api_client.post('/posts/moderation', data={'authors': [spammer.id]},
+                                   HTTP_AUTHORIZATION=staff_token, format='json', secure=True)
+        assert response.status_code == 200
+        # The posts of the author, and the comments of the author and on those posts.
+        assert response.data == {'posts': 3, 'comments': 4}
+
+        assert not Post.objects.filter(author=spammer, is_active=True).exists()
+        assert not Comment.objects.filter(post__in=spam_posts, is_active=True).exists()
+
+        post.refresh_from_db()
+        assert post.is_active
+        assert post.comment_count == 1
+
+        # Nothing is left to disable.
+        response = api_client.post('/posts/moderation', data={'authors': [spammer.id]},
+                                   HTTP_AUTHORIZATION=staff_token, format='json', secure=True)
+        assert response.data == {'posts': 0, 'comments': 0}
+
+    def test_moderate_ids(self, api_client, spam, staff_token):
+        spammer, spam_posts, post = spam
+        comment = Comment.objects.filter(post=post, author=spammer).first()
+
+        response = api_client.post('/posts/moderation',
+                                   data={'posts': [spam_posts[0].id], 'comments': [comment.id]},
+                                   HTTP_AUTHORIZATION=staff_token, format='json', secure=True)
+        assert response.status_code == 200
+        assert response.data == {'posts': 1, 'comments': 3}
+
+        post.refresh_from_db()
+        assert post.comment_count == 2
+        assert Post.objects.filter(author=spammer, is_active=True).count() == 2
+
+        response = api_client.get(f'/posts/{spam_posts[0].id}', secure=True)
+        assert response.status_code == 404
+
+    def test_only_staff(self, api_client, spam, token):
+        response = api_client.post('/posts/moderation', data={'authors': [spam[0].id]},
+                                   HTTP_AUTHORIZATION=token, format='json', secure=True)
+        assert response.status_code == 403
+
+    def test_empty_moderation(self, api_client, staff_token):
+        response = api_client.post('/posts/moderation', data={'posts': []},
+                                   HTTP_AUTHORIZATION=staff_token, format='json', secure=True)
+        assert response.status_code == 400
@@ -1,5 +1,7 @@
+from model_bakery import baker
 import pytest
 
+from common.pagination import Cursor, encode_cursor
 from post.models import Post
 
 
@@ -68,6 +70,49 @@ class TestPost:
         assert response.status_code == 200
         assert len(response.data) == 30
 
+    def test_list_posts_by_cursor(self, api_client, many_posts):
+        # The first page.
+        response = api_client.get('/posts?cursor=&pageSize=30', secure=True)
+        assert response.status_code == 200
+        assert response.data['prev'] is None
+        first_page = [post['id'] for post in response.data['results']]
+        assert first_page == sorted(first_page)
+        assert len(first_page) == 30
+
+        # Follow the next links to the end.
+        seen = list(first_page)
+        next_url = response.data['next']
+        while next_url is not None:
+            response = api_client.get(next_url, secure=True)
+            assert response.status_code == 200
+            seen += [post['id'] for post in response.data['results']]
+            next_url = response.data['next']
+        assert seen == sorted(post.id for post in many_posts)
+
+        # Go back to the previous page from the last page.
+        prev_url = response.data['prev']
+        response = api_client.get(prev_url, secure=True)
+        assert [post['id'] for post in response.data['results']] == seen[60:90]
+
+        # A cursor that is not issued by the server.
+        response = api_client.get('/posts?cursor=invalid', secure=True)
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize('position', [['abc'], [[1]], [None], [{'id': 1}], [1, 2],
+                                          [10**30], [-10**30]])
+    def test_forged_cursor(self, api_client, posts, position):
+        cursor = encode_cursor(Cursor(position))
+        response = api_client.get(f'/posts?cursor={cursor}', secure=True)
+        assert response.status_code == 400
+
+        cursor = encode_cursor(Cursor(position + [1]))
+        response = api_client.get(f'/posts?cursor={cursor}&ordering=commentCount', secure=True)
+        assert response.status_code == 400
+
+    def test_page_size_should_be_positive(self, api_client, posts):
+        assert api_client.get('/posts?cursor=&pageSize=-5', secure=True).status_code == 400
+        assert api_client.get('/posts?pageSize=0', secure=True).status_code == 400
+
     def test_detail_post(self, api_client, posts):
         response = api_client.get('/posts/1', secure=True)
         assert response.status_code == 200
@@ -77,6 +122,38 @@ class TestPost:
         response = api_client.get('/posts/65535', secure=True)
         assert response.status_code == 404
 
+    def test_detail_post_conditional_get(self, api_client, posts, token):
+        response = api_client.get('/posts/1', secure=True)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        response = api_client.get('/posts/1', HTTP_IF_NONE_MATCH=etag, secure=True)
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+        assert not response.content
+
+        response = api_client.get('/posts/1', HTTP_IF_MODIFIED_SINCE=last_modified, secure=True)
+        assert response.status_code == 304
+
+        # A new comment changes the version of the post.
+        response = api_client.post('/posts/comments', data={'content': 'new', 'post': 1},
+                                   HTTP_AUTHORIZATION=token, format='json', secure=True)
+        assert response.status_code == 201
+
+        response = api_client.get('/posts/1', HTTP_IF_NONE_MATCH=etag, secure=True)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+        assert len(response.data['comments']) == 1
+
+        # So does an update of the post.
+        etag = response['ETag']
+        response = api_client.patch('/posts/1', data={'title': 'after'},
+                                    HTTP_AUTHORIZATION=token, format='json', secure=True)
+        assert response.status_code == 200
+
+        response = api_client.get('/posts/1', HTTP_IF_NONE_MATCH=etag, secure=True)
+        assert response.status_code == 200
+        assert response.data['title'] == 'after'
+
     def test_update_post(self, api_client, posts, tags, token):
         before_update = api_client.get('/posts/1', secure=True)
 
@@ -129,3 +206,28 @@ class TestPost:
 
         assert response.status_code == 204
         assert after_delete.status_code == 404
+
+    def test_change_post_of_another_user(self, api_client, users, token):
+        post = baker.make(Post, author=users[1])
+
+        response = api_client.patch(f'/posts/{post.id}', data={'title': 'after'},
+                                    HTTP_AUTHORIZATION=token, format='json', secure=True)
+        assert response.status_code == 403
+        response = api_client.delete(f'/posts/{post.id}', HTTP_AUTHORIZATION=token, secure=True)
+        assert response.status_code == 403
+
+        post.refresh_from_db()
+        assert post.title != 'after'
+        assert post.is_active
+
+        response = api_client.patch('/posts/65535', data={'title': 'after'},
+                                    HTTP_AUTHORIZATION=token, format='json', secure=True)
+        assert response.status_code == 404
+
+    def test_delete_post_twice(self, api_client, users, token):
+        post = baker.make(Post, author=users[0])
+
+        response = api_client.delete(f'/posts/{post.id}', HTTP_AUTHORIZATION=token, secure=True)
+        assert response.status_code == 204
+        response = api_client.delete(f'/posts/{post.id}', HTTP_AUTHORIZATION=token, secure=True)
+        assert response.status_code == 404
@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+from asgiref.testing import ApplicationCommunicator
+from django.test import RequestFactory
+import pytest
+
+from common.asgi import PooledReadASGIHandler, pooled_action
+
+
+def get(application, path, method='GET'):
+    scope = {
+        'type': 'http', 'method': method, 'path': path, 'query_string': b'',
+        'headers': [(b'host', b'testserver'), (b'x-forwarded-proto', b'https')],
+        'http_version': '1.1', 'scheme': 'https',
+        'server': ('testserver', 443), 'client': ('127.0.0.1', 1024),
+    }
+
+    async def communicate():
+        communicator = ApplicationCommunicator(application, scope)
+        await communicator.send_input({'type': 'http.request', 'body': b''})
+        start = await communicator.receive_output(10)
+        body = await communicator.receive_output(10)
+        return start['status'], dict(start['headers']), body['body']
+
+    return asyncio.run(communicate())
+
+
+class TestPooledReadASGIHandler:
+    pytestmark = pytest.mark.django_db(transaction=True)
+
+    def test_pooled_actions(self):
+        factory = RequestFactory()
+        assert pooled_action(factory.get('/posts')) == 'list'
+        assert pooled_action(factory.get('/posts/1')) == 'retrieve'
+        assert pooled_action(factory.get('/posts/tags')) == 'list'
+        assert pooled_action(factory.get('/posts/comments')) is None
+        assert pooled_action(factory.post('/posts')) is None
+        assert pooled_action(factory.get('/no-such-page')) is None
+
+    def test_responses(self, tags):
+        application = PooledReadASGIHandler()
+
+        status, _, body = get(application, '/posts/tags')
+        assert status == 200
+        assert tags[0].title.encode() in body
+
+        status, _, _ = get(application, '/metrics')
+        assert status == 200
+
+    def test_busy(self, settings):
+        settings.ASYNC_READ_QUEUE_TIMEOUT = 0.01
+        settings.ASYNC_READ_CONCURRENCY = 0
+        application = PooledReadASGIHandler()
+
+        status, headers, _ = get(application, '/posts/tags')
+        assert status == 503
+        assert headers[b'Retry-After'] == b'1'
+
+    def test_timeout(self, settings, monkeypatch):
+        settings.ASYNC_READ_TIMEOUT = 0.01
+        application = PooledReadASGIHandler()
+        respond = application._respond
+
+        def slow_respond(request):
+            time.sleep(0.1)
+            return respond(request)
+
+        monkeypatch.setattr(application, '_respond', slow_respond)
+        status, _, _ = get(application, '/posts/tags')
+        assert status == 504
+        # The request still runs to the end on its thread.
+        application.executor.shutdown(wait=True)
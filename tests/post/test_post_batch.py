@@ -0,0 +1,86 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from post.api.post import BATCH_LIMIT
+from post.models import Post, Tag
+
+
+def make_posts(count, category, tags=('Python', 'django')):
+    return [{
+        'title': f'Imported {i}',
+        'content': 'Imported from the meetup site.',
+        'location': 'Seoul',
+        'capacity': 10,
+        'date': '2020-01-01',
+        'timeOfDay': 1,
+        'category': category.id,
+        'tags': [*tags, f'new{i}'],
+    } for i in range(count)]
+
+
+class TestPostBatch:
+    pytestmark = pytest.mark.django_db
+
+    def test_batch_create(self, api_client, users, categories, tags, token):
+        posts = make_posts(3, categories[0], tags=(tags[0].title, 'Python', 'python'))
+        response = api_client.post('/posts/batch', data=posts,
+                                   HTTP_AUTHORIZATION=token, format='json', secure=True)
+        assert response.status_code == 201
+
+        ids = [result['id'] for result in response.data]
+        created = Post.objects.filter(id__in=ids).order_by('id')
+        assert [post.title for post in created] == ['Imported 0', 'Imported 1', 'Imported 2']
+        assert all(post.author_id == users[0].id for post in created)
+        assert sorted(tag.title for tag in created[0].tags.all()) == \
+            sorted([tags[0].title, 'Python', 'new0'])
+        assert 'Imported' in created[0].search_document
+
+        response = api_client.get('/posts?tags=python', secure=True)
+        assert sorted(post['id'] for post in response.data) == ids
+
+    def test_batch_create_with_invalid_posts(self, api_client, categories, token):
+        posts = make_posts(5, categories[0])
+        posts[1]['category'] = 65535
+        del posts[2]['title']
+        posts[3]['category'] = '²'
+        del posts[4]['category']
+
+        response = api_client.post('/posts/batch', data=posts,
+                                   HTTP_AUTHORIZATION=token, format='json', secure=True)
+        assert response.status_code == 207
+        assert 'id' in response.data[0]
+        assert 'category' in response.data[1]['errors']
+        assert 'title' in response.data[2]['errors']
+        assert 'category' in response.data[3]['errors']
+        assert 'category' in response.data[4]['errors']
+        assert Post.objects.count() == 1
+        assert not Tag.objects.filter(title__in=['new1', 'new2', 'new3', 'new4']).exists()
+
+        # Nothing is created when every post is invalid.
+        response = api_client.post('/posts/batch', data=posts[1:],
+                                   HTTP_AUTHORIZATION=token, format='json', secure=True)
+        assert response.status_code == 400
+        assert Post.objects.count() == 1
+
+    def test_batch_limit(self, api_client, categories, token):
+        response = api_client.post('/posts/batch', data=make_posts(BATCH_LIMIT + 1, categories[0]),
+                                   HTTP_AUTHORIZATION=token, format='json', secure=True)
+        assert response.status_code == 400
+
+        response = api_client.post('/posts/batch', data={'title': 'not a list'},
+                                   HTTP_AUTHORIZATION=token, format='json', secure=True)
+        assert response.status_code == 400
+
+        response = api_client.post('/posts/batch', data=make_posts(1, categories[0]),
+                                   format='json', secure=True)
+        assert response.status_code == 401
+
+    @pytest.mark.parametrize('count', [1, 50])
+    def test_batch_queries(self, api_client, categories, token, count):
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.post('/posts/batch', data=make_posts(count, categories[0]),
+                                       HTTP_AUTHORIZATION=token, format='json', secure=True)
+        assert response.status_code == 201
+        # The same number of queries however many posts there are.
+        assert len(context.captured_queries) == 13
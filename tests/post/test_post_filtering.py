@@ -1,7 +1,9 @@
+from django.core.management import call_command
+from model_bakery import baker
 from model_bakery.recipe import Recipe
 import pytest
 
-from post.models import Post
+from post.models import Comment, Post
 
 TIME_OF_DAY = {
     'MORNING': 0,
@@ -53,6 +55,10 @@ def count_tags_of_multiple(response, *tag_titles):
         assert number_of_tags == len(tag_titles)
 
 
+def ids_of(response):
+    return [result['id'] for result in response.data]
+
+
 def check_data_duplication_of(response):
     ids = {result['id'] for result in response.data}
     assert len(ids) == len(response.data)
@@ -93,6 +99,40 @@ class TestPostFiltering:
         response = api_client.get(f'/posts?tags={tag_title1}&tags={tag_title2}', secure=True)
         assert response.status_code == 400
 
+    def test_post_on_tag_mode_filtering(self, api_client, posts, tags):
+        tag_title1, tag_title3 = tags[0].title, tags[2].title
+
+        # Tag titles are matched case-insensitively.
+        response = api_client.get(f'/posts?tags={tag_title3.upper()}', secure=True)
+        assert response.status_code == 200
+        assert [result['id'] for result in response.data] == [posts[2].id]
+
+        # Posts that have all of the tags.
+        response = api_client.get(f'/posts?tags={tag_title1},{tag_title3}&tagsMode=all',
+                                  secure=True)
+        assert response.status_code == 200
+        assert [result['id'] for result in response.data] == [posts[2].id]
+
+        # A tag that doesn't exist can't be matched by any post.
+        response = api_client.get(f'/posts?tags={tag_title1},nothing', secure=True)
+        assert response.status_code == 200
+        assert len(response.data) == 0
+
+        # Posts that have any of the tags.
+        response = api_client.get(f'/posts?tags={tag_title3},nothing&tagsMode=any', secure=True)
+        assert response.status_code == 200
+        assert [result['id'] for result in response.data] == [posts[2].id]
+
+        response = api_client.get(f'/posts?tags={tag_title1},{tag_title3}&tagsMode=any',
+                                  secure=True)
+        assert response.status_code == 200
+        assert len(response.data) == 3
+        check_data_duplication_of(response)
+
+        # An unknown mode.
+        response = api_client.get(f'/posts?tags={tag_title1}&tagsMode=none', secure=True)
+        assert response.status_code == 400
+
     def test_post_on_category_tag_filtering(self, api_client, posts, categories, tags):
         category_title, tag_title = categories[0].title, tags[1].title
         response = api_client.get(
@@ -132,3 +172,26 @@ class TestPostFiltering:
 
         for result in response.data:
             assert location in result['location']
+
+    def test_post_ordering_by_comment_count(self, api_client, posts):
+        for post, count in zip(posts, [1, 3, 1]):
+            baker.make(Comment, post=post, _quantity=count)
+        Post.objects.filter(id__in=[post.id for post in posts]).update(comment_count=0)
+        call_command('reconcile_comment_counts')
+
+        response = api_client.get('/posts?ordering=-commentCount', secure=True)
+        assert response.status_code == 200
+        assert ids_of(response) == [posts[1].id, posts[0].id, posts[2].id]
+
+        response = api_client.get('/posts?ordering=commentCount', secure=True)
+        assert ids_of(response) == [posts[0].id, posts[2].id, posts[1].id]
+
+        # The most discussed posts by the cursor.
+        response = api_client.get('/posts?ordering=-commentCount&cursor=&pageSize=2', secure=True)
+        first_page = [result['id'] for result in response.data['results']]
+        response = api_client.get(response.data['next'], secure=True)
+        second_page = [result['id'] for result in response.data['results']]
+        assert first_page + second_page == [posts[1].id, posts[0].id, posts[2].id]
+
+        response = api_client.get('/posts?ordering=title', secure=True)
+        assert response.status_code == 400
@@ -0,0 +1,22 @@
+from django.db import connection
+import pytest
+
+from benchmarks.post_indexes import explain_filters
+from post.seeding import seed_posts
+
+
+class TestPostIndexes:
+    pytestmark = pytest.mark.django_db
+
+    def test_date_filters_use_indexes(self):
+        seed_posts(2000)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        for result in explain_filters(page_size=20):
+            if 'date' in result['filters']:
+                assert result['index_scan'], result['plan']
+            elif not result['index_scan']:
+                # Without a date range the posts are walked in the order of IDs
+                # until the page is filled, which doesn't need a sort.
+                assert not result['sort'], result['plan']
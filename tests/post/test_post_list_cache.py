@@ -0,0 +1,62 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+
+def get_counting_queries(api_client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(url, secure=True)
+    assert response.status_code == 200
+    return response, len(context.captured_queries)
+
+
+class TestPostListCache:
+    pytestmark = pytest.mark.django_db
+
+    def test_cached_pages(self, api_client, posts, tags):
+        url = f'/posts?pageSize=10&tags={tags[0].title},{tags[1].title}&tagsMode=any'
+        response, number_of_queries = get_counting_queries(api_client, url)
+        assert number_of_queries > 0
+
+        # The same query is served from the cache.
+        cached, number_of_queries = get_counting_queries(api_client, url)
+        assert number_of_queries == 0
+        assert cached.data == response.data
+
+        # So are the same parameters in a different order and case.
+        url = f'/posts?tagsMode=any&tags={tags[1].title.upper()},{tags[0].title}&pageSize=10'
+        _, number_of_queries = get_counting_queries(api_client, url)
+        assert number_of_queries == 0
+
+        # Other parameters are not.
+        _, number_of_queries = get_counting_queries(api_client, '/posts?pageSize=5')
+        assert number_of_queries > 0
+
+    def test_cached_cursor_pages(self, api_client, many_posts):
+        response, _ = get_counting_queries(api_client, '/posts?cursor=')
+        cached, number_of_queries = get_counting_queries(api_client, '/posts?cursor=')
+        assert number_of_queries == 0
+        assert cached.data == response.data
+
+        # Links are built for each request.
+        assert cached.data['next'].startswith('https://testserver/posts?cursor=')
+        cached = api_client.get('/posts?cursor=', secure=False)
+        assert cached.data['next'].startswith('http://testserver/posts?cursor=')
+
+    def test_writes_make_pages_stale(self, api_client, posts, token):
+        response = api_client.get('/posts', secure=True)
+        assert len(response.data) == 3
+
+        response = api_client.patch(f'/posts/{posts[0].id}', data={'title': 'after'},
+                                    HTTP_AUTHORIZATION=token, format='json', secure=True)
+        assert response.status_code == 200
+
+        response = api_client.get('/posts', secure=True)
+        assert response.data[0]['title'] == 'after'
+
+        response = api_client.delete(f'/posts/{posts[0].id}',
+                                     HTTP_AUTHORIZATION=token, secure=True)
+        assert response.status_code == 204
+
+        response = api_client.get('/posts', secure=True)
+        assert len(response.data) == 2
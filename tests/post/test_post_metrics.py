@@ -0,0 +1,66 @@
+from model_bakery import baker
+from prometheus_client import REGISTRY
+import pytest
+
+from user.models import User
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestMetrics:
+    pytestmark = pytest.mark.django_db
+
+    def test_request_metrics(self, api_client, posts):
+        labels = {'view': 'PostAPI.list', 'method': 'GET'}
+        before = {
+            'requests': sample('http_requests_total', status='200', **labels),
+            'latency': sample('http_request_duration_seconds_count', **labels),
+            'queries': sample('http_request_db_queries_sum', **labels),
+            'misses': sample('cache_lookups_total', cache='post:list', result='miss'),
+            'hits': sample('cache_lookups_total', cache='post:list', result='hit'),
+        }
+
+        api_client.get('/posts', secure=True)
+        api_client.get('/posts', secure=True)
+
+        assert sample('http_requests_total', status='200', **labels) == before['requests'] + 2
+        assert sample('http_request_duration_seconds_count', **labels) == before['latency'] + 2
+        # The first request misses the cache and runs the queries of the list.
+        assert sample('http_request_db_queries_sum', **labels) == before['queries'] + 3
+        assert sample('cache_lookups_total', cache='post:list', result='miss') == \
+            before['misses'] + 1
+        assert sample('cache_lookups_total', cache='post:list', result='hit') == before['hits'] + 1
+        assert sample('http_response_size_bytes_count', **labels) >= 2
+
+    def test_views_are_labelled_by_action(self, api_client, posts, token):
+        api_client.post('/posts/comments', data={'content': 'new', 'post': posts[0].id},
+                        HTTP_AUTHORIZATION=token, format='json', secure=True)
+        api_client.get('/posts/65535', secure=True)
+        api_client.get('/no-such-page', secure=True)
+
+        response = api_client.get('/metrics', secure=True)
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+
+        content = response.content.decode()
+        assert 'http_requests_total{method="POST",status="201",view="CommentAPI.create"}' \
+            in content
+        assert 'http_requests_total{method="GET",status="404",view="PostAPI.retrieve"}' \
+            in content
+        assert 'http_requests_total{method="GET",status="404",view="<unresolved>"}' in content
+        assert 'http_request_db_duration_seconds_bucket' in content
+
+    def test_access(self, api_client, settings):
+        response = api_client.get('/metrics', REMOTE_ADDR='203.0.113.7', secure=True)
+        assert response.status_code == 403
+
+        settings.METRICS_ALLOWED_IPS = ['203.0.113.0/24']
+        response = api_client.get('/metrics', REMOTE_ADDR='203.0.113.7', secure=True)
+        assert response.status_code == 200
+
+        settings.METRICS_ALLOWED_IPS = []
+        api_client.force_login(baker.make(User, is_staff=True))
+        response = api_client.get('/metrics', REMOTE_ADDR='203.0.113.7', secure=True)
+        assert response.status_code == 200
@@ -0,0 +1,39 @@
+from model_bakery import baker
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from post.models import Post
+from post.projections import build_posts, project_posts
+from post.serializers import PostSerializer
+
+
+@pytest.fixture
+def mixed_posts(users, categories, tags):
+    return [
+        baker.make(Post, author=users[0], category=categories[0], tags=tags, comment_count=3),
+        baker.make(Post, author=users[1], category=categories[1], tags=[tags[2], tags[0]]),
+        baker.make(Post, author=None, category=None),
+    ]
+
+
+class TestPostProjections:
+    pytestmark = pytest.mark.django_db
+
+    def test_same_data_as_post_serializer(self, mixed_posts):
+        posts = Post.objects.with_relations().order_by('id')
+        expected = PostSerializer(posts, many=True).data
+
+        data = build_posts(project_posts(Post.objects.order_by('id')))
+        assert data == expected
+        assert JSONRenderer().render(data) == JSONRenderer().render(expected)
+
+    def test_list_posts(self, api_client, mixed_posts):
+        expected = PostSerializer(Post.objects.with_relations().order_by('id'), many=True).data
+
+        response = api_client.get('/posts', secure=True)
+        assert response.status_code == 200
+        assert response.data == expected
+
+        response = api_client.get('/posts?cursor=&ordering=-commentCount', secure=True)
+        assert response.status_code == 200
+        assert response.data['results'][0] == expected[0]
@@ -0,0 +1,100 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+import pytest
+
+from post.models import Comment, Post
+
+PAGE_SIZES = [1, 10, 50]
+
+
+@pytest.fixture
+def related_posts(users, categories, tags):
+    return baker.make(Post, author=users[0], category=categories[0], tags=tags, _quantity=50)
+
+
+def count_queries(api_client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(url, secure=True)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+class TestPostQueries:
+    pytestmark = pytest.mark.django_db
+
+    @pytest.mark.parametrize('page_size', PAGE_SIZES)
+    def test_list_posts(self, api_client, related_posts, page_size):
+        # COUNT(*), the page of posts joined with authors and categories, and the tags.
+        assert count_queries(api_client, f'/posts?pageSize={page_size}') == 3
+
+    @pytest.mark.parametrize('page_size', PAGE_SIZES)
+    def test_list_posts_by_cursor(self, api_client, related_posts, page_size):
+        # The page of posts joined with authors and categories, and the tags.
+        assert count_queries(api_client, f'/posts?cursor=&pageSize={page_size}') == 2
+
+    @pytest.mark.parametrize('number_of_comments', PAGE_SIZES)
+    def test_detail_post(self, api_client, related_posts, users, number_of_comments):
+        post = related_posts[0]
+        baker.make(Comment, post=post, author=users[1], _quantity=number_of_comments)
+
+        # The version of the post, the post joined with its author and category,
+        # the tags, and the comments.
+        assert count_queries(api_client, f'/posts/{post.id}') == 4
+
+    @pytest.mark.parametrize('number_of_tags', [1, 10])
+    def test_create_post(self, api_client, categories, tags, token, number_of_tags):
+        # Half of the tags exist already.
+        titles = [tag.title for tag in tags] + [f'new{i}' for i in range(number_of_tags)]
+        post_data = {
+            'title': 'test_title',
+            'content': 'test_content',
+            'location': 'test_location',
+            'capacity': 10,
+            'date': '2020-01-01',
+            'timeOfDay': 1,
+            'category': categories[0].id,
+            'tags': titles,
+        }
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.post('/posts', data=post_data,
+                                       HTTP_AUTHORIZATION=token, format='json', secure=True)
+        assert response.status_code == 201
+        assert len(context.captured_queries) == 16
+
+        post = Post.objects.get(title='test_title')
+        assert sorted(tag.title for tag in post.tags.all()) == sorted(titles)
+
+    def test_detail_post_not_modified(self, api_client, related_posts):
+        post = related_posts[0]
+        etag = api_client.get(f'/posts/{post.id}', secure=True)['ETag']
+
+        # Only the version of the post.
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(f'/posts/{post.id}', HTTP_IF_NONE_MATCH=etag, secure=True)
+        assert response.status_code == 304
+        assert len(context.captured_queries) == 1
+
+    def test_delete_post(self, api_client, users, token):
+        post = baker.make(Post, author=users[0])
+
+        # The user of the token and the conditional update of the post.
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.delete(f'/posts/{post.id}',
+                                         HTTP_AUTHORIZATION=token, secure=True)
+        assert response.status_code == 204
+        assert len([query for query in context.captured_queries
+                    if query['sql'].startswith('UPDATE')]) == 1
+        assert len(context.captured_queries) == 2
+
+    def test_delete_comment(self, api_client, users, related_posts, token):
+        comment = baker.make(Comment, post=related_posts[0], author=users[0])
+
+        # The user of the token, the conditional update of the comment
+        # and the update of its post in a transaction.
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.delete(f'/posts/comments/{comment.id}',
+                                         HTTP_AUTHORIZATION=token, secure=True)
+        assert response.status_code == 204
+        assert len([query for query in context.captured_queries
+                    if 'SAVEPOINT' not in query['sql']]) == 3
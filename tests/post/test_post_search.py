@@ -0,0 +1,87 @@
+from django.core.management import call_command
+from model_bakery import baker
+import pytest
+
+from post.models import Post, Tag
+
+
+@pytest.fixture
+def posts():
+    python, django = baker.make(Tag, title='Python'), baker.make(Tag, title='Django')
+    post1 = baker.make(Post, title='Weekly meet-up', content='We talk about python and django.',
+                       location='Gangnam')
+    post2 = baker.make(Post, title='Python study', content='Beginners are welcome.',
+                       location='Seoul', tags=[django])
+    post3 = baker.make(Post, title='Side project', content='Looking for a designer.',
+                       location='Pangyo', tags=[python])
+    return [post1, post2, post3]
+
+
+def ids_of(response):
+    return [result['id'] for result in response.data]
+
+
+def result_ids_of(response):
+    return [result['id'] for result in response.data['results']]
+
+
+class TestPostSearch:
+    pytestmark = pytest.mark.django_db
+
+    def test_search_posts(self, api_client, posts):
+        post1, post2, post3 = posts
+
+        # Posts that match in the title are ranked first.
+        response = api_client.get('/posts?q=python', secure=True)
+        assert response.status_code == 200
+        assert ids_of(response)[0] == post2.id
+        assert set(ids_of(response)) == {post1.id, post2.id, post3.id}
+
+        # Every word must match.
+        response = api_client.get('/posts?q=python django', secure=True)
+        assert set(ids_of(response)) == {post1.id, post2.id}
+
+        # Match the location.
+        response = api_client.get('/posts?q=pangyo', secure=True)
+        assert ids_of(response) == [post3.id]
+
+        # Search results are paginated by the cursor as well.
+        ranked = ids_of(api_client.get('/posts?q=python', secure=True))
+        response = api_client.get('/posts?q=python&cursor=&pageSize=2', secure=True)
+        first_page = result_ids_of(response)
+        response = api_client.get(response.data['next'], secure=True)
+        assert first_page + result_ids_of(response) == ranked
+
+    def test_search_document_follows_changes(self, api_client, posts, token):
+        post1 = posts[0]
+        response = api_client.patch(f'/posts/{post1.id}', data={'tags': ['Rust']},
+                                    HTTP_AUTHORIZATION=token, format='json', secure=True)
+        assert response.status_code == 200
+
+        response = api_client.get('/posts?q=rust', secure=True)
+        assert ids_of(response) == [post1.id]
+
+    @pytest.mark.parametrize('tags', [[], ['Rust']])
+    def test_new_posts_are_searchable(self, api_client, categories, token, tags):
+        post_data = {'title': 'Rust study', 'content': 'Ownership', 'location': 'Jamsil',
+                     'capacity': 4, 'date': '2020-01-01', 'timeOfDay': 1,
+                     'category': categories[0].id, 'tags': tags}
+        response = api_client.post('/posts', data=post_data,
+                                   HTTP_AUTHORIZATION=token, format='json', secure=True)
+        assert response.status_code == 201
+
+        post = Post.objects.get(title='Rust study')
+        assert ids_of(api_client.get('/posts?q=jamsil', secure=True)) == [post.id]
+
+    def test_posts_created_without_the_api_are_searchable(self, api_client, categories):
+        post = Post.objects.create(title='Go study', content='Goroutines', location='Jamsil',
+                                   capacity=4, date='2020-01-01', time_of_day=1,
+                                   category=categories[0])
+        assert ids_of(api_client.get('/posts?q=goroutines', secure=True)) == [post.id]
+
+    def test_rebuild_search_documents(self, api_client, posts):
+        Post.objects.update(search_document='')
+        assert ids_of(api_client.get('/posts?q=pangyo', secure=True)) == []
+
+        call_command('rebuild_search_documents', batch_size=2)
+        assert ids_of(api_client.get('/posts?q=pangyo', secure=True)) == [posts[2].id]
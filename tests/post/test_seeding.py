@@ -0,0 +1,41 @@
+from django.core.management import call_command
+import pytest
+
+from benchmarks.api import run
+from post.models import Comment, Post, Tag
+from user.models import User
+
+
+class TestSeeding:
+    pytestmark = pytest.mark.django_db
+
+    def test_seed(self):
+        call_command('seed', users=5, categories=3, tags=10, posts=50, tags_per_post=2,
+                     comments_per_post=2, reply_depth=3)
+
+        assert User.objects.count() == 5
+        assert Tag.objects.count() == 10
+        assert Post.objects.count() == 50
+        assert Post.tags.through.objects.count() == 100
+
+        # Two top-level comments on every post, each with a reply which has a reply.
+        assert Comment.objects.count() == 50 * 2 * 3
+        assert Comment.objects.filter(parent_comment=None).count() == 50 * 2
+        reply = Comment.objects.filter(parent_comment__parent_comment__isnull=False).first()
+        assert reply.post_id == reply.parent_comment.post_id
+
+        post = Post.objects.first()
+        assert post.comment_count == 6
+        assert post.search_document
+
+    def test_benchmark_covers_every_route(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+        call_command('seed', users=5, posts=20, comments_per_post=1, reply_depth=2)
+
+        report = run(requests=1, warmup=0)
+        assert report['uncovered'] == []
+        for result in report['results']:
+            assert result['requests'] == 1
+            if 'account-confirm-email' not in result['route']:
+                # That route renders a TemplateView without a template.
+                assert all(int(status) < 500 for status in result['statuses']), result
@@ -1,5 +1,7 @@
 import pytest
 
+from post.models import Tag
+
 
 class TestTag:
     pytestmark = pytest.mark.django_db
@@ -8,3 +10,24 @@ class TestTag:
         response = api_client.get('/posts/tags', secure=True)
         assert response.status_code == 200
         assert len(response.data) > 1
+
+    def test_list_tags_with_etag(self, api_client, tags):
+        response = api_client.get('/posts/tags', secure=True)
+        etag = response['ETag']
+
+        response = api_client.get('/posts/tags', HTTP_IF_NONE_MATCH=etag, secure=True)
+        assert response.status_code == 304
+        assert not response.content
+
+        # Tags created in bulk invalidate the cached list as well.
+        Tag.objects.get_or_create_ids(['new'])
+        response = api_client.get('/posts/tags', HTTP_IF_NONE_MATCH=etag, secure=True)
+        assert response.status_code == 200
+        assert len(response.data) == len(tags) + 1
+
+    def test_get_or_create_tag_ids(self, tags):
+        titles = ['new', tags[1].title.upper(), ' ', ' New ', tags[0].title]
+        ids = Tag.objects.get_or_create_ids(titles)
+        new = Tag.objects.get(title='new')
+        assert ids == [new.id, tags[1].id, tags[0].id]
+        assert Tag.objects.count() == len(tags) + 1
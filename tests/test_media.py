@@ -0,0 +1,129 @@
+import os
+
+from django.utils.http import http_date
+import pytest
+
+from common.media import UnsatisfiableRange, parse_range
+
+CONTENT = bytes(range(256)) * 8
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.MEDIA_SENDFILE = None
+    (tmp_path / 'images').mkdir()
+    (tmp_path / 'images' / 'banner.png').write_bytes(CONTENT)
+    return tmp_path
+
+
+def body(response):
+    return b''.join(response.streaming_content)
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-99', (0, 99)),
+    ('bytes=100-', (100, 2047)),
+    ('bytes=-100', (1948, 2047)),
+    ('bytes=-5000', (0, 2047)),
+    ('bytes=2000-5000', (2000, 2047)),
+    ('bytes=0-1,5-6', None),
+    ('bytes=5-1', None),
+    ('bytes=-', None),
+    ('lines=0-1', None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, len(CONTENT)) == expected
+
+
+@pytest.mark.parametrize('header', ['bytes=2048-', 'bytes=-0'])
+def test_parse_unsatisfiable_range(header):
+    with pytest.raises(UnsatisfiableRange):
+        parse_range(header, len(CONTENT))
+
+
+class TestServeMedia:
+    def test_file(self, client, media):
+        response = client.get('/media/images/banner.png')
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'image/png'
+        assert response['Content-Length'] == str(len(CONTENT))
+        assert response['Accept-Ranges'] == 'bytes'
+        assert 'max-age=31536000' in response['Cache-Control']
+        assert body(response) == CONTENT
+
+    def test_not_found(self, client, media):
+        assert client.get('/media/images/missing.png').status_code == 404
+        assert client.get('/media/images').status_code == 404
+        assert client.get('/media/../settings.py').status_code == 404
+
+    def test_incoming_files_are_hidden(self, client, media):
+        (media / '.incoming').mkdir()
+        (media / '.incoming' / 'upload.png').write_bytes(CONTENT)
+        assert client.get('/media/.incoming/upload.png').status_code == 404
+        assert client.get('/media/images/../.incoming/upload.png').status_code == 404
+
+    def test_methods(self, client, media):
+        assert client.head('/media/images/banner.png').status_code == 200
+        assert client.post('/media/images/banner.png').status_code == 405
+
+    def test_not_modified(self, client, media):
+        response = client.get('/media/images/banner.png')
+
+        response = client.get('/media/images/banner.png', HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == 304
+        assert response['ETag']
+
+        response = client.get('/media/images/banner.png',
+                              HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        assert response.status_code == 304
+
+    def test_modified(self, client, media):
+        path = media / 'images' / 'banner.png'
+        etag = client.get('/media/images/banner.png')['ETag']
+        os.utime(path, (0, 0))
+
+        response = client.get('/media/images/banner.png', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['Last-Modified'] == http_date(0)
+
+    def test_range(self, client, media):
+        response = client.get('/media/images/banner.png', HTTP_RANGE='bytes=10-19')
+        assert response.status_code == 206
+        assert response['Content-Range'] == 'bytes 10-19/2048'
+        assert response['Content-Length'] == '10'
+        assert body(response) == CONTENT[10:20]
+
+        response = client.get('/media/images/banner.png', HTTP_RANGE='bytes=-16')
+        assert body(response) == CONTENT[-16:]
+
+    def test_unsatisfiable_range(self, client, media):
+        response = client.get('/media/images/banner.png', HTTP_RANGE='bytes=4096-')
+        assert response.status_code == 416
+        assert response['Content-Range'] == 'bytes */2048'
+
+    def test_if_range(self, client, media):
+        etag = client.get('/media/images/banner.png')['ETag']
+
+        response = client.get('/media/images/banner.png', HTTP_RANGE='bytes=0-9',
+                              HTTP_IF_RANGE=etag)
+        assert response.status_code == 206
+
+        # The file has changed since, so all of it is sent.
+        response = client.get('/media/images/banner.png', HTTP_RANGE='bytes=0-9',
+                              HTTP_IF_RANGE='"stale"')
+        assert response.status_code == 200
+        assert body(response) == CONTENT
+
+    @pytest.mark.parametrize('backend, header, value', [
+        ('x-accel-redirect', 'X-Accel-Redirect', '/protected-media/images/banner.png'),
+        ('x-sendfile', 'X-Sendfile', None),
+    ])
+    def test_sendfile(self, client, media, settings, backend, header, value):
+        settings.MEDIA_SENDFILE = backend
+
+        response = client.get('/media/images/banner.png')
+        assert response.status_code == 200
+        assert response.content == b''
+        assert response['Content-Type'] == 'image/png'
+        assert response[header] == (value or str(media / 'images' / 'banner.png'))
@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+import io
+from uuid import UUID
+
+from django.utils.translation import gettext_lazy
+import pytest
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from common import parsers, renderers
+from common.parsers import FastJSONParser
+from common.renderers import FastJSONRenderer
+
+KST = timezone(timedelta(hours=9))
+
+PAYLOAD = [
+    OrderedDict([
+        ('id', 1),
+        ('title', '개발 스터디 \u2028 모집'),
+        ('date', date(2020, 1, 1)),
+        ('createdDate', datetime(2020, 1, 1, 9, 30, 15, 123456, tzinfo=KST)),
+        ('updatedDate', datetime(2020, 1, 1, 0, 30, tzinfo=timezone.utc)),
+        ('time', time(12, 0)),
+        ('duration', timedelta(hours=2)),
+        ('fee', Decimal('12.50')),
+        ('uuid', UUID(int=1)),
+        ('label', gettext_lazy('Category')),
+        ('tags', ({'id': 1, 'title': 'Python'}, {'id': 2, 'title': 'Django'})),
+        ('scores', {1: 0.5, 2: None}),
+    ]),
+]
+
+
+class TestFastJSONRenderer:
+    def test_same_output_as_json_renderer(self):
+        expected = JSONRenderer().render(PAYLOAD)
+        assert FastJSONRenderer().render(PAYLOAD) == expected
+
+    def test_indented_output(self):
+        expected = JSONRenderer().render(PAYLOAD, 'application/json; indent=4')
+        assert FastJSONRenderer().render(PAYLOAD, 'application/json; indent=4') == expected
+
+    def test_fallback_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert FastJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+
+    def test_fallback_for_big_integers(self):
+        data = {'big': 2**70}
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    @pytest.mark.parametrize('value', [float('nan'), float('inf'), float('-inf')])
+    def test_non_finite_floats_are_null(self, value):
+        with pytest.raises(ValueError):
+            JSONRenderer().render({'score': value})
+        assert FastJSONRenderer().render({'score': value}) == b'{"score":null}'
+
+
+class TestFastJSONParser:
+    def test_parse(self):
+        stream = io.BytesIO('{"title": "모집", "tags": ["a", "b"], "capacity": 10}'.encode())
+        data = FastJSONParser().parse(stream)
+        assert data == {'title': '모집', 'tags': ['a', 'b'], 'capacity': 10}
+
+    def test_parse_error(self):
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"title": '))
+
+    def test_fallback_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(parsers, 'orjson', None)
+        assert FastJSONParser().parse(io.BytesIO(b'{"id": 1}')) == {'id': 1}
+
+    def test_other_encodings(self):
+        stream = io.BytesIO('{"title": "모집"}'.encode('utf-16'))
+        data = FastJSONParser().parse(stream, parser_context={'encoding': 'utf-16'})
+        assert data == {'title': '모집'}